@@ -0,0 +1,101 @@
+"""Micro-benchmark of note key dispatch in OP1ModeSelectorComponent.
+
+Compares the previous path (list.index(sender) followed by an if/elif
+chain on the current mode) with OP1DispatchTable, for presses spread over
+the 13 note keys of the transport mode.
+
+    python bench/bench_dispatch.py [presses]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'op1'))
+
+import consts  # noqa: E402
+from OP1Dispatch import OP1DispatchTable  # noqa: E402
+
+NOTE_KEYS = [53, 55, 57, 59, 60, 62, 64, 65, 67, 69, 71, 72, 74, 76]
+NOTE_KEYS_SHIFTED = [77, 79, 81, 83, 84, 86, 88, 89, 91, 93, 95, 96, 98]
+
+
+class FakeButton(object):
+
+    def __init__(self, identifier):
+        self._identifier = identifier
+
+    def message_identifier(self):
+        return self._identifier
+
+
+class LegacySelector(object):
+    """Previous note key handling, kept here for comparison only."""
+
+    def __init__(self):
+        self._current_mode = consts.OP1_MODE_TRANSPORT
+        self.note_keys_buttons = [FakeButton(n) for n in NOTE_KEYS]
+        self.note_keys_shifted_buttons = [FakeButton(n) for n in NOTE_KEYS_SHIFTED]
+        self.calls = 0
+
+    def set_loop(self, index, set_loop_start):
+        self.calls += 1
+
+    def note_key_pressed(self, value, sender):
+        index = self.note_keys_buttons.index(sender)
+
+        if (self._current_mode == consts.OP1_MODE_MIXER):
+            self.calls += 1
+        elif (self._current_mode == consts.OP1_MODE_TRANSPORT):
+            self.set_loop(index, False)
+
+
+class DispatchSelector(object):
+
+    def __init__(self):
+        self.note_keys_buttons = [FakeButton(n) for n in NOTE_KEYS]
+        self._note_keys_dispatch = OP1DispatchTable()
+        for i in range(consts.NUM_TRACKS):
+            self._note_keys_dispatch.register(consts.OP1_MODE_MIXER, NOTE_KEYS[i],
+                                              self.select_track_key_pressed, i)
+            self._note_keys_dispatch.register(consts.OP1_MODE_TRANSPORT, NOTE_KEYS[i],
+                                              self.loop_key_pressed, i)
+        self._note_keys_dispatch.activate(consts.OP1_MODE_TRANSPORT)
+        self.calls = 0
+
+    def select_track_key_pressed(self, value, index):
+        self.calls += 1
+
+    def loop_key_pressed(self, value, index):
+        self.calls += 1
+
+    def note_key_pressed(self, value, sender):
+        self._note_keys_dispatch.dispatch(value, sender)
+
+
+def run(selector, presses):
+    buttons = selector.note_keys_buttons[:consts.NUM_TRACKS]
+    handler = selector.note_key_pressed
+
+    def press_all():
+        for i in range(presses):
+            handler(127, buttons[i % consts.NUM_TRACKS])
+
+    best = min(timeit.repeat(press_all, number=1, repeat=5))
+    assert selector.calls == presses * 5
+    return best
+
+
+def main(presses=100000):
+    legacy = run(LegacySelector(), presses)
+    table = run(DispatchSelector(), presses)
+    print('%-22s %10s %12s' % ('path', 'total (s)', 'per event'))
+    for name, seconds in (('list.index + if/elif', legacy), ('dispatch table', table)):
+        print('%-22s %10.4f %9.0f ns' % (name, seconds, seconds / presses * 1e9))
+    print('speedup: %.2fx' % (legacy / table))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
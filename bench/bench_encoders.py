@@ -0,0 +1,127 @@
+"""Live API calls issued by the transport encoders for a fast-turn trace.
+
+Replays a recorded style trace of OP-1 encoder messages (relative two's
+complement, several messages per 100ms display tick) through the previous
+per-message handling and through OP1EncoderAccumulator, counting the
+scrub_by calls that reach Live. Encoders 3 and 4 are then turned on the
+headless surface in transport mode, counting the scroll_view / zoom_view
+calls made by OP1.transport_scroll and OP1.transport_zoom.
+
+    python bench/bench_encoders.py [seconds]
+
+Needs the stand-in Live modules of sim/, so like the surface it runs on
+Python 2.7.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(HERE, '..', 'op1'))
+sys.path.insert(0, os.path.join(HERE, '..', 'sim'))
+
+import driver  # noqa: E402
+from op1 import consts  # noqa: E402
+from OP1Encoders import OP1EncoderAccumulator  # noqa: E402
+
+CW = 4
+CCW = 124
+
+
+class FakeSong(object):
+
+    def __init__(self):
+        self.calls = 0
+        self.position = 0
+
+    def scrub_by(self, amount):
+        self.calls += 1
+        self.position += amount
+
+
+def fast_turn_trace(seconds):
+    """Messages per tick: a slow start, a fast spin, a reversal and a stop."""
+    pattern = [1, 2, 4, 8, 12, 12, 8, 4, 0, 0, -2, -6, -10, -6, -2, 0, 0, 0]
+    ticks = []
+    for i in range(seconds * 10):
+        n = pattern[i % len(pattern)]
+        ticks.append([CW if n > 0 else CCW] * abs(n))
+    return ticks
+
+
+def legacy(trace):
+    song = FakeSong()
+
+    def e1_transport_scrub(value):
+        if value == 4:
+            song.scrub_by(1)
+        else:
+            song.scrub_by(-1)
+
+    for messages in trace:
+        for value in messages:
+            e1_transport_scrub(value)
+    return song
+
+
+def accumulated(trace, acceleration):
+    song = FakeSong()
+    encoder = OP1EncoderAccumulator(song.scrub_by, acceleration=acceleration)
+
+    for messages in trace:
+        for value in messages:
+            encoder.add(value)
+        encoder.flush()
+    return song
+
+
+def view_calls(trace, encoder, per_message):
+    """scroll_view / zoom_view calls for the trace turned on encoder 3 or 4.
+    per_message applies each message directly, as the previous handling did."""
+    h = driver.Harness(driver.build_song(8, 4))
+    h.set_mode(consts.OP1_MODE_TRANSPORT)
+    h.tick()
+
+    surface = h.surface
+    if encoder == consts.OP1_ENCODER_3:
+        (apply_steps, call) = (surface.transport_scroll, 'Application.View.scroll_view')
+    else:
+        (apply_steps, call) = (surface.transport_zoom, 'Application.View.zoom_view')
+
+    h.clear_stats()
+    for messages in trace:
+        for value in messages:
+            if per_message:
+                apply_steps(1 if value == CW else -1)
+            else:
+                h.cc(encoder, value)
+        h.tick()
+
+    calls = h.api_calls(call).get(call, 0)
+    h.disconnect()
+    return calls
+
+
+def main(seconds=60):
+    trace = fast_turn_trace(seconds)
+    messages = sum(len(m) for m in trace)
+
+    print('%d encoder messages over %d ticks' % (messages, len(trace)))
+    print('%-26s %10s %10s' % ('path', 'API calls', 'travel'))
+    for name, song in (('per message', legacy(trace)),
+                       ('per tick', accumulated(trace, False)),
+                       ('per tick + acceleration', accumulated(trace, True))):
+        print('%-26s %10d %10d' % (name, song.calls, song.position))
+
+    print()
+    print('%-26s %10s %10s' % ('path', 'scroll', 'zoom'))
+    for (name, per_message) in (('per message', True), ('per tick', False)):
+        print('%-26s %10d %10d' % (name, view_calls(trace, consts.OP1_ENCODER_3, per_message),
+                                   view_calls(trace, consts.OP1_ENCODER_4, per_message)))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
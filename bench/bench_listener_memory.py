@@ -0,0 +1,147 @@
+"""Memory benchmark for the clip slot listener registry.
+
+Runs many midi map rebuilds on a song whose tracks, scenes and clips keep
+being created and deleted, and prints the listener store sizes and the
+number of live Python objects. Both must stay flat over the run.
+
+    python bench/bench_listener_memory.py [rebuilds]
+"""
+
+from __future__ import print_function
+
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'op1'))
+
+from OP1ClipListeners import OP1ClipSlotRegistry  # noqa: E402
+
+
+class FakeLiveObject(object):
+    """Minimal Live object: add/remove/has listener methods and dying."""
+
+    def __init__(self):
+        self._listeners = {}
+        self._alive = True
+
+    def _listener_methods(self, name):
+        listeners = self._listeners.setdefault(name, [])
+        return listeners.append, listeners.remove, listeners.__contains__
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        for prefix, index in (('add_', 0), ('remove_', 1)):
+            if name.startswith(prefix) and name.endswith('_listener'):
+                return self._listener_methods(name[len(prefix):-9])[index]
+        if name.endswith('_has_listener'):
+            return self._listener_methods(name[:-13])[2]
+        raise AttributeError(name)
+
+    def notify(self, name):
+        for listener in list(self._listeners.get(name, ())):
+            listener()
+
+    def kill(self):
+        self._alive = False
+        self._listeners = {}
+
+    def __eq__(self, other):
+        return (not self._alive) if other is None else self is other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = object.__hash__
+
+
+class FakeClipSlot(FakeLiveObject):
+
+    def __init__(self):
+        FakeLiveObject.__init__(self)
+        self.clip = None
+
+    @property
+    def has_clip(self):
+        return self.clip is not None
+
+    def create_clip(self):
+        self.clip = FakeLiveObject()
+        self.notify('has_clip')
+
+    def delete_clip(self):
+        self.clip.kill()
+        self.clip = None
+        self.notify('has_clip')
+
+
+class FakeTrack(FakeLiveObject):
+
+    def __init__(self, num_scenes):
+        FakeLiveObject.__init__(self)
+        self.clip_slots = tuple(FakeClipSlot() for _ in range(num_scenes))
+
+
+class FakeSong(FakeLiveObject):
+
+    def __init__(self, num_tracks, num_scenes):
+        FakeLiveObject.__init__(self)
+        self.num_scenes = num_scenes
+        self.tracks = tuple(FakeTrack(num_scenes) for _ in range(num_tracks))
+
+    def replace_track(self, index):
+        self.tracks[index].kill()
+        tracks = list(self.tracks)
+        tracks[index] = FakeTrack(self.num_scenes)
+        self.tracks = tuple(tracks)
+        self.notify('tracks')
+
+    def add_scene(self):
+        for track in self.tracks:
+            track.clip_slots += (FakeClipSlot(),)
+            track.notify('clip_slots')
+        self.notify('scenes')
+
+    def delete_scene(self):
+        for track in self.tracks:
+            track.clip_slots[-1].kill()
+            track.clip_slots = track.clip_slots[:-1]
+            track.notify('clip_slots')
+        self.notify('scenes')
+
+
+def main(rebuilds=500):
+    song = FakeSong(40, 50)
+    registry = OP1ClipSlotRegistry(song, lambda cs: None)
+    registry.sync()
+
+    print('%8s %8s %14s %14s %12s' % ('rebuild', 'touched', 'slot_listeners',
+                                      'clip_listeners', 'gc_objects'))
+    for i in range(rebuilds + 1):
+        # churning the song between rebuilds
+        track = song.tracks[i % len(song.tracks)]
+        slot = track.clip_slots[i % len(track.clip_slots)]
+        if slot.has_clip:
+            slot.delete_clip()
+        else:
+            slot.create_clip()
+        song.replace_track((i * 7) % len(song.tracks))
+        if i % 2:
+            song.delete_scene()
+        else:
+            song.add_scene()
+
+        registry.sync()
+
+        if i % (rebuilds // 10 or 1) == 0:
+            gc.collect()
+            print('%8d %8d %14d %14d %12d' % (i, registry.touched, len(registry.slot_callbacks),
+                                              len(registry.clip_color_callbacks),
+                                              len(gc.get_objects())))
+
+    registry.disconnect()
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,111 @@
+"""Encode cost per frame of the OP-1 text sysex message.
+
+Compares write_text of the baseline OP1 (growing a list and concatenating
+tuples), copied verbatim below, with OP1SysExEncoder for typical display
+texts. Clip color frames are built the baseline way by both, they are only
+checked to produce the same bytes.
+
+    python bench/bench_sysex.py [frames]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'op1'))
+
+import consts  # noqa: E402
+from OP1SysEx import OP1SysExEncoder  # noqa: E402
+
+TEXTS = ['perform\rmode', 'sel. track\raudio 12 drums', '> 1b 120.00\r12.3.4',
+         'sel. scene\rintro', '>* /16 128.50\r104.1.1']
+
+CLIP_COLORS = [0xff0000, 0x00ff00, 0x0000ff, 0x123456, 0xfefefe]
+
+
+class BaselineOP1(object):
+    """Frame building of the baseline OP1, kept here for comparison only.
+    _send_midi keeps the last frame instead of sending it."""
+
+    def __init__(self):
+        self.text_start_sequence = (0xf0, 0x00, 0x20, 0x76, 0x00, 0x03)
+        self.text_end_sequence = (0xf7,)
+        self.text_color_start_sequence = (0xf0, 0x0, 0x20, 0x76, 0x00, 0x04)
+        self.sequence = None
+
+    def _send_midi(self, sequence):
+        self.sequence = sequence
+
+    def write_text(self, msg):
+        text_list = []
+        sequence = ()
+
+        text_list.append(len(msg.strip()))
+
+        for i in msg.strip():
+            text_list.append(ord(i))
+
+        sequence = self.text_start_sequence + tuple(text_list) + self.text_end_sequence
+        self._send_midi(sequence)
+
+    def send_clip_colors(self, clip_colors):
+        # color packing of update_display_clips, without the session lookups
+        count = 0
+        colors = []
+        length = []
+        sequence = ()
+
+        for clip_color in clip_colors:
+            count += 1
+            color = (((clip_color >> 16) & 0x000000ff) >> 1,
+                     ((clip_color >> 8) & 0x000000ff) >> 1,
+                     (clip_color & 0x000000ff) >> 1)
+            colors += color
+
+        length.append(count)
+        sequence = self.text_color_start_sequence + tuple(length) + \
+            tuple(colors) + self.text_end_sequence
+        self._send_midi(sequence)
+
+
+def run(encode, texts, frames):
+    def encode_all():
+        for i in range(frames):
+            encode(texts[i % len(texts)])
+
+    return min(timeit.repeat(encode_all, number=1, repeat=5))
+
+
+def main(frames=100000):
+    baseline = BaselineOP1()
+    encoder = OP1SysExEncoder()
+
+    def encode(msg):
+        # the display compositor strips the text before encoding it
+        return encoder.text(msg.strip())
+
+    # both paths must produce the same frames
+    for text in TEXTS:
+        baseline.write_text(text)
+        assert baseline.sequence == encode(text)
+
+    clip_colors = [CLIP_COLORS[i % len(CLIP_COLORS)] for i in range(consts.NUM_TRACKS)]
+    strip = bytearray()
+    for clip_color in clip_colors:
+        strip += bytearray((((clip_color >> 16) & 0xff) >> 1, ((clip_color >> 8) & 0xff) >> 1,
+                            (clip_color & 0xff) >> 1))
+    baseline.send_clip_colors(clip_colors)
+    assert baseline.sequence == encoder.colors(consts.NUM_TRACKS, strip)
+
+    print('%-10s %10s %12s' % ('path', 'total (s)', 'per frame'))
+    results = (('baseline', run(baseline.write_text, TEXTS, frames)),
+               ('encoder', run(encode, TEXTS, frames)))
+    for name, seconds in results:
+        print('%-10s %10.4f %9.0f ns' % (name, seconds, seconds / frames * 1e9))
+    print('speedup: %.2fx' % (results[0][1] / results[1][1]))
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
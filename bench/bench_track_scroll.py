@@ -0,0 +1,59 @@
+"""Selection scroll throughput of the OP-1 surface, run headless.
+
+Moves Live's selected track one track at a time, as holding mic / com does,
+through a song of mixed midi and return tracks in each OP-1 mode, with a
+display tick after every `per_tick` selections. Reports selections per
+second, Live API calls per selection and how many strip rebinds ran.
+
+    python bench/bench_track_scroll.py [steps] [tracks] [per_tick]
+
+Needs the stand-in Live modules of sim/, so like the surface it runs on
+Python 2.7.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sim'))
+
+import driver  # noqa: E402
+from op1 import consts  # noqa: E402
+
+MODE_NAMES = ('perform', 'clip', 'transport', 'mixer')
+
+
+def scroll(h, steps, per_tick):
+    view = h.song.view
+    tracks = tuple(h.song.tracks) + tuple(h.song.return_tracks) + (h.song.master_track,)
+    for i in range(steps):
+        view.selected_track = tracks[i % len(tracks)]
+        if (i + 1) % per_tick == 0:
+            h.tick()
+
+    # letting the last selection settle
+    h.tick(consts.TRACK_SELECT_SETTLE_TICKS)
+
+
+def main(steps=2000, tracks=64, per_tick=1):
+    h = driver.Harness(driver.build_song(tracks, 8))
+    settle = h.surface._strip_settle
+
+    print('%-10s %12s %16s %10s' % ('mode', 'sel. / s', 'API calls / sel.', 'rebinds'))
+    for mode in range(consts.NUM_MODES):
+        h.set_mode(mode)
+        h.tick(consts.TRACK_SELECT_SETTLE_TICKS + 1)
+        h.clear_stats()
+        fired = settle.fired
+
+        (_, seconds) = driver.timed(scroll, h, steps, per_tick)
+        calls = sum(h.api_calls().values())
+        print('%-10s %12.0f %16.1f %10d' % (MODE_NAMES[mode], steps / seconds,
+                                            float(calls) / steps, settle.fired - fired))
+
+    h.disconnect()
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
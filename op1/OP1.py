@@ -21,8 +21,10 @@
 
 from __future__ import with_statement
 
+import os
+import timeit
+
 import Live
-import time
 
 import consts
 
@@ -31,16 +33,32 @@ import consts
 from _Framework.ControlSurface import ControlSurface
 from _Framework.TransportComponent import TransportComponent
 from _Framework.MixerComponent import MixerComponent
-from _Framework.ButtonElement import ButtonElement
-from _Framework.EncoderElement import EncoderElement
 from _Framework.SessionComponent import SessionComponent
-from _Framework.InputControlElement import MIDI_CC_TYPE
 
 # Browser, Arranger, Session, Detail, Detail/Clip, Detail/DeviceChain
 
 # OP-1 imports
 
 from OP1ModeSelectorComponent import OP1ModeSelectorComponent
+from OP1Display import OP1DisplayCompositor, OP1ClipStrip
+from OP1Handshake import OP1Handshake
+from OP1ClipListeners import OP1ClipSlotRegistry, OP1SessionRingRegistry
+from OP1Controls import OP1ControlPool
+from OP1Encoders import OP1EncoderAccumulator
+from OP1SongState import OP1SongStateCache
+from OP1ViewState import OP1ViewState
+from OP1Names import OP1NameFormatter, OP1NameObserver
+from OP1SysEx import OP1SysExEncoder, ENABLE_FRAME, DISABLE_FRAME, IDENTITY_REQUEST_FRAME
+from OP1Trace import OP1TraceRecorder, RECORD_IN, RECORD_OUT, RECORD_TICK
+from OP1Profiler import OP1Profiler
+from OP1TrackStates import OP1TrackStateIndex
+from OP1Debounce import OP1SettleTimer
+from OP1MidiQueue import OP1MidiQueue, MSG_IDENTITY, MSG_ENABLE, MSG_DISABLE, MSG_TEXT, MSG_COLORS
+
+# surface callbacks timed when profiling is enabled
+PROFILED_CALLBACKS = ('update_display', 'build_midi_map', 'receive_midi',
+                      'selected_track_changed', 'selected_scene_changed',
+                      'update_display_clips', 'mode_index_changed')
 
 QUANT_ORDER = [
     Live.Song.Quantization.q_no_q,
@@ -60,12 +78,6 @@ QUANT_ORDER = [
 ]
 
 
-# to properly display strings on op1 display we need to do some character substitution
-REPL_CHARS = " " * 32
-REPL_CHARS += """ !\"# %    *+,-./0123456789:;<=> @abcdefghijklmnopqrstuvwxyz    _ abcdefghijklmnopqrstuvwxyz -  """   # noqa: E501
-REPL_CHARS += " " * 129
-
-
 def get_q_idx(q):
     idx = QUANT_ORDER.index(q) if q in QUANT_ORDER else None
     return idx
@@ -79,35 +91,40 @@ def get_q_enum(idx):
     return QUANT_ORDER[idx]
 
 
-def to_op1_printable(txt):
-    """convert a string into OP1 printable character.
-    This will change non-printable chars, that would
-    be otherwise displayed as '?', into spaces."""
-    tr = str(txt).translate(REPL_CHARS)  # replace non-printable chars with spaces
-    tr = ' '.join(tr.split())            # replace multiple white space chars with a single space
-    return tr[:20]                       # there is 20 character display limit for the bottom line
-
-
 class OP1(ControlSurface):
     def __init__(self, c_instance):
+        start = timeit.default_timer()
+
+        # midi trace recorder, set before the framework may send or receive midi
+        self._trace = None
+
         ControlSurface.__init__(self, c_instance)
         with self.component_guard():
             self.c_instance = c_instance
 
-            self.retries_count = 0
+            # opening midi trace, when enabled, before anything is sent
+            if consts.MIDI_TRACE_PATH:
+                self.start_trace(os.path.expanduser(consts.MIDI_TRACE_PATH))
+
+            # wrapping callbacks with timers, when enabled, before they are registered
+            self._profiler = None
+            if consts.PROFILE_CALLBACKS:
+                self._profiler = OP1Profiler()
+                for name in PROFILED_CALLBACKS:
+                    self._profiler.instrument(self, name)
+
             self.device_connected = False
 
-            self.clip_color_callbacks = {}
-            self.slot_callbacks = {}
+            self.enable_sequence = ENABLE_FRAME
+            self.disable_sequence = DISABLE_FRAME
 
-            self.text_start_sequence = (0xf0, 0x00, 0x20, 0x76, 0x00, 0x03)
-            self.text_end_sequence = (0xf7,)
-            self.enable_sequence = (0xf0, 0x00, 0x20, 0x76, 0x00, 0x01, 0x02, 0xf7)
-            self.disable_sequence = (0xf0, 0x00, 0x20, 0x76, 0x00, 0x01, 0x00, 0xf7)
+            self.id_sequence = IDENTITY_REQUEST_FRAME
 
-            self.id_sequence = (0xf0, 0x7e, 0x7f, 0x06, 0x01, 0xf7)
+            # encoder of text and clip colors sysex frames
+            self._sysex = OP1SysExEncoder()
 
-            self.text_color_start_sequence = (0xf0, 0x0, 0x20, 0x76, 0x00, 0x04)
+            # outbound midi queue, rate limited per display tick
+            self._midi_out = OP1MidiQueue(self._send_midi)
 
 #           self.log('INITIALIZING')
 
@@ -121,26 +138,33 @@ class OP1(ControlSurface):
 
             self.show_message("Version: " + consts.VERSION)
 
-            # reseting text
-            self.write_text(' ')
+            # initializing shared pool of OP-1 control elements
+            self._control_pool = OP1ControlPool()
 
-            # reset display clips
-            self.reset_display_clips()
+            # initializing display framebuffer
+            self._display = OP1DisplayCompositor(self._send_text)
 
-            # getting browser visible state
-            self.session_browser_visible = self.app.view.is_view_visible("Browser")
+            # initializing connection handshake, driven by update_display ticks
+            self._handshake = OP1Handshake(self.send_identity_request,
+                                           self.device_connected_callback,
+                                           self.device_disconnected_callback)
 
-            # getting browser visible state
-            self.arrange_browser_visible = self.app.view.is_view_visible("Browser")
+            # display text and clip colors are sent as a whole once the OP-1 answers
+            # the identity request, there is nothing to reset before
 
-            # getting detail view visible state
-            self.detail_visible = self.app.view.is_view_visible("Detail")
+            # browser and detail view visible state, observed from the first view toggle on
+            self._view_state = None
 
             # getting back to arranger state
             self.back_to_arranger_state = self.song().back_to_arranger
 
-            # initializing channel strip to null
-            self._channel_strip = None
+            # initializing display names cache, evicted when shown names change
+            self._names = OP1NameFormatter()
+            self._track_name = OP1NameObserver(self._names, self.selected_track_name_changed)
+            self._scene_name = OP1NameObserver(self._names, self.selected_scene_name_changed)
+
+            # initializing transport display text cache, fed by song listeners
+            self._song_state = OP1SongStateCache(self.song(), self.get_quant_str)
 
             # initializing mixer component
             self._mixer = MixerComponent(consts.NUM_TRACKS, 2)
@@ -151,19 +175,33 @@ class OP1(ControlSurface):
             self.set_highlighting_session_component(self._session)
             self._suppress_session_highlight = False
 
+            # initializing clip colors strip, flushed on display ticks
+            self._clip_strip = OP1ClipStrip(consts.NUM_TRACKS, self._send_clip_colors)
+
+            # initializing clip slot listeners registry, synced on midi map rebuilds
+            if consts.CLIP_LISTENERS_SESSION_RING_ONLY:
+                self._clip_listeners = OP1SessionRingRegistry(self._session,
+                                                              consts.NUM_TRACKS,
+                                                              self.clip_slot_changed)
+            else:
+                self._clip_listeners = OP1ClipSlotRegistry(self.song(), self.clip_slot_changed)
+
             # initializing transport component
             self._transport = TransportComponent()
 
             # configuring operation mode selector buttons
-            self._operation_mode_buttons = \
-                ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_MODE_1_BUTTON), \
-                ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_MODE_2_BUTTON), \
-                ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_MODE_3_BUTTON), \
-                ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_MODE_4_BUTTON),
+            self._operation_mode_buttons = tuple(self._control_pool.buttons((
+                consts.OP1_MODE_1_BUTTON, consts.OP1_MODE_2_BUTTON,
+                consts.OP1_MODE_3_BUTTON, consts.OP1_MODE_4_BUTTON)))
 
             # initializing operation mode selector
             self._operation_mode_selector = OP1ModeSelectorComponent(self, self._transport, self._mixer, self._session)  # noqa: E501
 
+            # timing mode switches
+            if self._profiler is not None:
+                self._profiler.instrument(self._operation_mode_selector, 'update',
+                                          'OP1ModeSelectorComponent.update')
+
             # setting operation mode selector buttons
             self._operation_mode_selector.set_mode_buttons(self._operation_mode_buttons)
 
@@ -171,87 +209,66 @@ class OP1(ControlSurface):
             self._operation_mode_selector.add_mode_index_listener(self.mode_index_changed)
 
             # setting global transport assignments
-            self._transport.set_stop_button(ButtonElement(True, MIDI_CC_TYPE,
-                                                          consts.CHANNEL,
-                                                          consts.OP1_STOP_BUTTON))
-            self._transport.set_metronome_button(ButtonElement(True,
-                                                               MIDI_CC_TYPE,
-                                                               consts.CHANNEL,
-                                                               consts.OP1_METRONOME_BUTTON))
-            self._transport.set_tap_tempo_button(ButtonElement(True,
-                                                               MIDI_CC_TYPE,
-                                                               consts.CHANNEL,
-                                                               consts.OP1_HELP_BUTTON))
-            self._transport.set_loop_button(ButtonElement(True, MIDI_CC_TYPE,
-                                                          consts.CHANNEL,
-                                                          consts.OP1_SS3_BUTTON))
-            self._transport.set_overdub_button(ButtonElement(True,
-                                                             MIDI_CC_TYPE,
-                                                             consts.CHANNEL,
-                                                             consts.OP1_SS4_BUTTON))
-            self._play_button = ButtonElement(True, MIDI_CC_TYPE,
-                                              consts.CHANNEL, consts.OP1_PLAY_BUTTON)
-            self._rec_button = ButtonElement(True, MIDI_CC_TYPE,
-                                             consts.CHANNEL, consts.OP1_REC_BUTTON)
+            self._transport.set_stop_button(self._control_pool.button(consts.OP1_STOP_BUTTON))
+            self._transport.set_metronome_button(
+                self._control_pool.button(consts.OP1_METRONOME_BUTTON))
+            self._transport.set_tap_tempo_button(self._control_pool.button(consts.OP1_HELP_BUTTON))
+            self._transport.set_loop_button(self._control_pool.button(consts.OP1_SS3_BUTTON))
+            self._transport.set_overdub_button(self._control_pool.button(consts.OP1_SS4_BUTTON))
+            self._play_button = self._control_pool.button(consts.OP1_PLAY_BUTTON)
+            self._rec_button = self._control_pool.button(consts.OP1_REC_BUTTON)
 #                        self._transport.set_play_button(self._play_button)
             self.shift_pressed = False
             self._play_button.add_value_listener(self.play_button_callback)
             self._rec_button.add_value_listener(self.record_button_callback)
 
-# setting global session assignments
-            self._ss6_button = ButtonElement(True, MIDI_CC_TYPE,
-                                             consts.CHANNEL, consts.OP1_SS6_BUTTON)
-            self._micro_button = ButtonElement(True, MIDI_CC_TYPE,
-                                               consts.CHANNEL, consts.OP1_MICRO)
-            self._com_button = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_COM)
-
-            # encoder for transport control - leave it empty for now
-            self._encoder_1 = EncoderElement(MIDI_CC_TYPE, consts.CHANNEL,
-                                             consts.OP1_ENCODER_1,
-                                             Live.MidiMap.MapMode.relative_two_compliment)
-            self._encoder_2 = EncoderElement(MIDI_CC_TYPE, consts.CHANNEL,
-                                             consts.OP1_ENCODER_2,
-                                             Live.MidiMap.MapMode.relative_two_compliment)
-            self._encoder_3 = EncoderElement(MIDI_CC_TYPE, consts.CHANNEL,
-                                             consts.OP1_ENCODER_3,
-                                             Live.MidiMap.MapMode.relative_two_compliment)
-            self._encoder_4 = EncoderElement(MIDI_CC_TYPE, consts.CHANNEL,
-                                             consts.OP1_ENCODER_4,
-                                             Live.MidiMap.MapMode.relative_two_compliment)
+            # session buttons and encoders are allocated by the modes using them
+
 # setting misc listeners
 
-            self._encoder_1_push = ButtonElement(True, MIDI_CC_TYPE,
-                                                 consts.CHANNEL, consts.OP1_ENCODER_1_PUSH)
-            self._encoder_2_push = ButtonElement(True, MIDI_CC_TYPE,
-                                                 consts.CHANNEL, consts.OP1_ENCODER_2_PUSH)
-            self._encoder_3_push = ButtonElement(True, MIDI_CC_TYPE,
-                                                 consts.CHANNEL, consts.OP1_ENCODER_3_PUSH)
-            self._encoder_4_push = ButtonElement(True, MIDI_CC_TYPE,
-                                                 consts.CHANNEL, consts.OP1_ENCODER_4_PUSH)
+            self._encoder_3_push = self._control_pool.button(consts.OP1_ENCODER_3_PUSH)
+            self._encoder_4_push = self._control_pool.button(consts.OP1_ENCODER_4_PUSH)
 
             self._encoder_3_push.add_value_listener(self.e3_push_callback)
             self._e3_pressed = False
             self._encoder_4_push.add_value_listener(self.e4_push_callback)
             self._e4_pressed = False
 
-            self.mainview_toggle_button = ButtonElement(False, MIDI_CC_TYPE,
-                                                        consts.CHANNEL,
-                                                        consts.OP1_ARROW_DOWN_BUTTON)
+            # shift + encoder 1 push logs the callback profile and starts over
+            if self._profiler is not None:
+                self._encoder_1_push = self._control_pool.button(consts.OP1_ENCODER_1_PUSH)
+                self._encoder_1_push.add_value_listener(self.e1_push_callback)
+
+            # transport encoder messages are summed and applied once per display tick,
+            # scroll and zoom are not accelerated as each step costs a Live call
+            self._e1_scrub = OP1EncoderAccumulator(self.transport_scrub, acceleration=True)
+            self._e2_quantization = OP1EncoderAccumulator(self.transport_quantization)
+            self._e3_scroll = OP1EncoderAccumulator(self.transport_scroll)
+            self._e4_zoom = OP1EncoderAccumulator(self.transport_zoom)
+            self._transport_encoders = (self._e1_scrub, self._e2_quantization,
+                                        self._e3_scroll, self._e4_zoom)
+
+            self.mainview_toggle_button = self._control_pool.button(
+                consts.OP1_ARROW_DOWN_BUTTON, is_momentary=False)
             self.mainview_toggle_button.add_value_listener(self.mainview_toggle_button_callback)
 
-            self.detailview_toggle_button = ButtonElement(False, MIDI_CC_TYPE,
-                                                          consts.CHANNEL,
-                                                          consts.OP1_SCISSOR_BUTTON)
+            self.detailview_toggle_button = self._control_pool.button(
+                consts.OP1_SCISSOR_BUTTON, is_momentary=False)
             self.detailview_toggle_button.add_value_listener(self.detailview_toggle_button_callback)  # noqa: E501
 
-            self.clear_track_button = ButtonElement(True, MIDI_CC_TYPE,
-                                                    consts.CHANNEL, consts.OP1_SS8_BUTTON)
+            # tracks currently armed, soloed or muted, reset by the clear track button
+            self._track_states = OP1TrackStateIndex(self.song())
+
+            self.clear_track_button = self._control_pool.button(consts.OP1_SS8_BUTTON)
             self.clear_track_button.add_value_listener(self.clear_track_button_callback)
 
-            self.back_to_arranger_button = ButtonElement(True, MIDI_CC_TYPE,
-                                                         consts.CHANNEL, consts.OP1_SEQ_BUTTON)
+            self.back_to_arranger_button = self._control_pool.button(consts.OP1_SEQ_BUTTON)
             self.back_to_arranger_button.add_value_listener(self.back_to_arranger_button_callback)
 
+            # rebinding strip controls only once track selection stops moving
+            self._strip_settle = OP1SettleTimer(consts.TRACK_SELECT_SETTLE_TICKS,
+                                                self._operation_mode_selector.bind_channel_strip)
+
             # adding value listener for selected track change
             self.song().view.add_selected_track_listener(self.selected_track_changed)
 
@@ -260,105 +277,106 @@ class OP1(ControlSurface):
 
             # setting assignments for currently selected track
             self.selected_track_changed()
+            self._strip_settle.flush()
 
             # setting assignments for currently selected scene
             self.selected_scene_changed()
 
+            self.log("STARTUP IN %.2f ms (%d controls allocated)" %
+                     ((timeit.default_timer() - start) * 1000.0, self._control_pool.allocations))
+
+    @property
+    def view_state(self):
+        # starting to observe Live views the first time a toggle needs them
+        if self._view_state is None:
+            self._view_state = OP1ViewState(self.app.view)
+        return self._view_state
+
+    def start_trace(self, path):
+        try:
+            self._trace = OP1TraceRecorder(path)
+            self.log("RECORDING MIDI TRACE: " + path)
+        except IOError as e:
+            self.log("MIDI TRACE DISABLED: " + str(e))
+
+    def stop_trace(self):
+        if self._trace is not None:
+            self.log("MIDI TRACE CLOSED: %d records" % self._trace.records)
+            self._trace.close()
+            self._trace = None
+
+    def receive_midi(self, midi_bytes):
+        if self._trace is not None:
+            self._trace.record(RECORD_IN, midi_bytes)
+        ControlSurface.receive_midi(self, midi_bytes)
+
+    def _send_midi(self, midi_event_bytes, *a, **k):
+        if self._trace is not None:
+            self._trace.record(RECORD_OUT, midi_event_bytes)
+        return ControlSurface._send_midi(self, midi_event_bytes, *a, **k)
+
     def handle_sysex(self, midi_bytes):
-        if ((midi_bytes[6] == 32) and (midi_bytes[7] == 118)):
-            self.device_connected = True
-            self.log("OP-1 CONNECTED. SENDING ABLETON LIVE MODE INIT SEQUENCE")
-            self._send_midi(self.enable_sequence)
-
-    def add_clip_slot_listeners(self):
-        # self.log('ADDING CLIP SLOT LISTENERS')
-
-        # creating an empty list for all clip slots
-        clip_slots = []
-
-        # getting a reference to all tracks
-        tracks = self.song().tracks
-
-        # appending all tracks clip slots to clip_slots
-        for track in tracks:
-            clip_slots.append(track.clip_slots)
-
-        # iterating over all clip slots
-        for t in range(len(clip_slots)):
-            for c in range(len(clip_slots[t])):
-                clip_slot = clip_slots[t][c]
-
-                # adding has clip listener to clip slot
-                self.add_slot_listener(clip_slot)
-
-                # if clip slot has clip
-                if clip_slot.has_clip:
-                    # adding clip listeners
-                    self.add_clip_listener(clip_slot.clip)
-
-    def rem_clip_slot_listeners(self):
-        # self.log('REMOVING CLIP SLOT LISTENERS')
-
-        # iterate over all clip color change callbacks
-        for c in self.clip_color_callbacks:
-            # if clip still exists
-            if c is not None:
-                # and it has a has clip listener
-                if c.color_has_listener(self.clip_color_callbacks[c]) == 1:
-                    # remove it
-                    c.remove_color_listener(self.clip_color_callbacks[c])
-
-        # iterate over all clip slot callbacks
-        for cs in self.slot_callbacks:
-            # if clip slot still exists
-            if cs is not None:
-                # and it has a has clip listener
-                if cs.has_clip_has_listener(self.slot_callbacks[cs]) == 1:
-                    # remove it
-                    cs.remove_has_clip_listener(self.slot_callbacks[cs])
-
-    def add_slot_listener(self, cs):
-        # setting has clip listener
-        callback = lambda: self.has_clip_listener(cs)
-
-        # if we don't have a clip slot has clip listener for this clip slot yet
-        if not(cs in self.slot_callbacks):
-            # adding has clip callback to clip slot
-            cs.add_has_clip_listener(callback)
-
-            # saving callback for future release
-            self.slot_callbacks[cs] = callback
-
-    def add_clip_listener(self, clip):
-        # setting callback for clip color change
-        color_callback = lambda: self.update_display_clips()
-
-        # if we don't have a clip color change callback for this clip yet
-        if not(clip in self.clip_color_callbacks):
-            # adding clip color change callback
-            clip.add_color_listener(color_callback)
-
-            # saving callback for future release
-            self.clip_color_callbacks[clip] = color_callback
-
-    def has_clip_listener(self, cs):
-        # clip slot has clip listener callback
-        if cs.has_clip:
-            # add clip listener
-            self.add_clip_listener(cs.clip)
-        else:
-            # update display if clip slot was removed
-            self.update_display_clips()
+        # identity reply from teenage engineering device
+        if (len(midi_bytes) > 7) and (midi_bytes[6] == 32) and (midi_bytes[7] == 118):
+            self._handshake.identity_received()
+
+    def send_identity_request(self):
+        if not self._handshake.connected:
+            self.log("TRYING OP-1 CONNECTION")
+            if self._handshake.retries_exhausted:
+                self.log("OP-1 NOT FOUND. WAITING FOR MIDI PORT CHANGE")
+        self._midi_out.send(MSG_IDENTITY, self.id_sequence)
+
+    def device_connected_callback(self):
+        self.device_connected = True
+        self.log("OP-1 CONNECTED. SENDING ABLETON LIVE MODE INIT SEQUENCE")
+        self._midi_out.send(MSG_ENABLE, self.enable_sequence)
+
+        # device may have missed earlier frames, resend current text and clip colors
+        self._display.invalidate()
+        self._display.flush()
+        self._clip_strip.invalidate()
+        self._clip_strip.flush()
+
+    def device_disconnected_callback(self):
+        self.device_connected = False
+        self.log("OP-1 NOT RESPONDING. WAITING FOR RECONNECTION")
+
+    def clip_slot_changed(self, cs):
+        # clip was added, removed or recolored in a clip slot, the clip strip
+        # column is refreshed on next display tick
+        self._clip_strip.slot_changed(cs)
 
     def session_offset_changed(self):
-        # if session component offset changes, update display
-        self.update_display_clips()
+        # moving clip listeners along with the session ring
+        self._clip_listeners.sync()
+
+        # if session component offset changes, update display on next tick
+        self.update_clip_strip_slots()
 
     def selected_scene_changed(self):
+        # moving clip listeners along with the session ring
+        self._clip_listeners.sync()
+
+        # following renames of the selected scene
+        self._scene_name.observe(self.song().view.selected_scene)
+
         # if on clip mode update display
         if (self._operation_mode_selector.mode_index == consts.OP1_MODE_CLIP):
             self.update_display_clip_mode()
 
+    def e1_push_callback(self, value):
+        if (value == 127) and self.shift_pressed:
+            self.log_profile()
+            # the next dump covers the callbacks since this one
+            self._profiler.reset()
+
+    def log_profile(self):
+        if self._profiler is None:
+            return
+        for line in self._profiler.report():
+            self.log("PROFILE " + line)
+
     def e3_push_callback(self, value):
         self._e3_pressed = True if value == 127 else False
 
@@ -366,36 +384,41 @@ class OP1(ControlSurface):
         self._e4_pressed = True if value == 127 else False
 
     def e1_transport_scrub(self, value):
-        if value == 4:
-            self.song().scrub_by(1)
-        else:
-            self.song().scrub_by(-1)
+        self._e1_scrub.add(value)
 
     def e2_transport_scrub(self, value):
-        if value == 4:
-            x = 1
-        else:
-            x = -1
+        self._e2_quantization.add(value)
+
+    def e3_transport_scroll(self, value):
+        self._e3_scroll.add(value)
+
+    def e4_transport_zoom(self, value):
+        self._e4_zoom.add(value)
+
+    def transport_scrub(self, steps):
+        self.song().scrub_by(steps)
+
+    def transport_quantization(self, steps):
         idx = get_q_idx(self.song().clip_trigger_quantization)
-        self.song().clip_trigger_quantization = get_q_enum(idx + x)
+        self.song().clip_trigger_quantization = get_q_enum(idx + steps)
 
-    def e_transport_scroll(self, value, b):
+    def transport_scroll(self, steps):
         """This will move arrangement cursor left/right, with a selection
-        if pressed. Up/Down modifiers do not do anything in Live 9.2 """
-        if value == 4:
+        if pressed. Up/Down modifiers do not do anything in Live 9.2
+        scroll_view() has no step count, so the API needs one call per step."""
+        if steps > 0:
             x = Live.Application.Application.View.NavDirection.right
         else:
             x = Live.Application.Application.View.NavDirection.left
-        self.app.view.scroll_view(x, "Arranger", b)
-
-    def e3_transport_scroll(self, value):
-        self.e_transport_scroll(value, self._e3_pressed)
+        for _ in range(min(abs(steps), consts.ENCODER_MAX_VIEW_STEPS)):
+            self.app.view.scroll_view(x, "Arranger", self._e3_pressed)
 
-    def e4_transport_zoom(self, value):
+    def transport_zoom(self, steps):
         """Zoom arrangement view 'into' the track or make track widget bigger/smaller.
         The boolean parameter to zoom_view() does funky things
-        and is not really useful to set it to True."""
-        if value == 4:
+        and is not really useful to set it to True. Like scroll_view(),
+        zoom_view() has no step count and is called once per step."""
+        if steps > 0:
             x = Live.Application.Application.View.NavDirection.down \
                 if self._e4_pressed \
                 else Live.Application.Application.View.NavDirection.right
@@ -403,7 +426,8 @@ class OP1(ControlSurface):
             x = Live.Application.Application.View.NavDirection.up \
                 if self._e4_pressed \
                 else Live.Application.Application.View.NavDirection.left
-        self.app.view.zoom_view(x, "Arranger", False)
+        for _ in range(min(abs(steps), consts.ENCODER_MAX_VIEW_STEPS)):
+            self.app.view.zoom_view(x, "Arranger", False)
 
     def play_button_callback(self, value):
         if value == 127:
@@ -441,85 +465,29 @@ class OP1(ControlSurface):
     def clear_track_button_callback(self, value):
         # if clear track button was called, reset track
         if (value == 127):
-            for i in range(len(self.song().tracks)):
-                track = self.song().tracks[i]
-                if track.can_be_armed is True:
-                    self.song().tracks[i].arm = 0
-                self.song().tracks[i].solo = 0
-                self.song().tracks[i].mute = 0
-
-            for i in range(len(self.song().return_tracks)):
-                self.song().tracks[i].solo = 0
-                self.song().tracks[i].mute = 0
-
-    def clear_return_track_assignment(self, strip):
-        # clear return track assingments
-        strip.set_volume_control(None)
-        strip.set_pan_control(None)
-        strip.set_mute_button(None)
-        strip.set_solo_button(None)
-
-    def clear_track_assignment(self, strip):
-        # clear track assignments
-        strip.set_volume_control(None)
-        strip.set_pan_control(None)
-        strip.set_mute_button(None)
-        strip.set_solo_button(None)
-        strip.set_arm_button(None)
-
-    def clear_tracks_assigments(self):
-        # for all normal tracks, clear assignments
-        self.clear_track_assignment(self._mixer.selected_strip())
-        self.clear_return_track_assignment(self._mixer.selected_strip())
-        self._mixer.selected_strip().set_send_controls(tuple((None, None)))
-        for i in range(consts.NUM_TRACKS):
-            strip = self._mixer.channel_strip(i)
-            if (strip is not None):
-                self.clear_track_assignment(strip)
+            writes = self._track_states.reset()
+            self.log("TRACKS RESET: " + str(writes) + " CHANGES")
 
-        # for all return tracks, clear assignments
-        for i in range(2):
-            return_strip = self._mixer.return_strip(i)
-            if (return_strip is not None):
-                self.clear_return_track_assignment(return_strip)
+    def selected_scene_name_changed(self):
+        # if on clip mode update display
+        if (self._operation_mode_selector.mode_index == consts.OP1_MODE_CLIP):
+            self.update_display_clip_mode()
 
-    def selected_track_changed(self):
+    def selected_track_name_changed(self):
         # if on mixer mode update display
         if (self._operation_mode_selector.mode_index == consts.OP1_MODE_MIXER):
             self.update_display_mixer_mode()
 
-        # clear track assignments
-        self.clear_tracks_assigments()
-
-        # getting selected strip
-        self._channel_strip = self._mixer.selected_strip()
-
-        # setting solo button
-        self._channel_strip.set_solo_button(self._ss6_button)
-
-        # if track can be armed, set arm button
-        if (self._channel_strip._track.can_be_armed):
-            b = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS7_BUTTON)
-            self._channel_strip.set_arm_button(b)
-
-        # if track is no master, set mute button
-        if (self._channel_strip._track != self.song().master_track):
-            b = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS5_BUTTON)
-            self._channel_strip.set_mute_button(b)
-
-        # if transport mode, we don't want to map encoders
-        if (self._operation_mode_selector.mode_index == consts.OP1_MODE_TRANSPORT):
-            return
-
-        # perform track assignments
-        self._channel_strip.set_volume_control(self._encoder_1)
-        self._channel_strip.set_pan_control(self._encoder_2)
+    def selected_track_changed(self):
+        # following renames of the selected track
+        self._track_name.observe(self.song().view.selected_track)
 
-        # setting a tuple of encoders to control sends
-        send_controls = self._encoder_3, self._encoder_4,
+        # if on mixer mode update display
+        if (self._operation_mode_selector.mode_index == consts.OP1_MODE_MIXER):
+            self.update_display_mixer_mode()
 
-        # setting send encoders
-        self._channel_strip.set_send_controls(tuple(send_controls))
+        # binding selected track controls for current mode, once selection settled
+        self._strip_settle.trigger()
 
     def back_to_arranger_button_callback(self, value):
         if (value == 127):
@@ -534,12 +502,10 @@ class OP1(ControlSurface):
                 self.song().undo()
         else:
             if (value == 127):
-                if (self.app.view.is_view_visible("Session")):
+                if (self.view_state.is_visible("Session")):
                     self.app.view.show_view("Arranger")
-                    self.arrange_browser_visible = self.app.view.is_view_visible("Browser")
                 else:
                     self.app.view.show_view("Session")
-                    self.session_browser_visible = self.app.view.is_view_visible("Browser")
 
     def detailview_toggle_button_callback(self, value):
         if self.shift_pressed is True:
@@ -547,24 +513,20 @@ class OP1(ControlSurface):
                 self.song().redo()
         else:
             if (value == 127):
-                if (self.detail_visible is True):
-                    self.detail_visible = False
+                if (self.view_state.detail_visible is True):
                     self.app.view.hide_view("Detail")
                 else:
-                    self.detail_visible = True
                     self.app.view.show_view("Detail")
 
     def write_text(self, msg):
-        text_list = []
-        sequence = ()
-
-        text_list.append(len(msg.strip()))
-
-        for i in msg.strip():
-            text_list.append(ord(i))
+        # text goes through the display framebuffer, which only sends changes
+        self._display.write(msg)
 
-        sequence = self.text_start_sequence + tuple(text_list) + self.text_end_sequence
-        self._send_midi(sequence)
+    def _send_text(self, text):
+        # framebuffer is resent as a whole when the OP-1 connects
+        if not self.device_connected:
+            return
+        self._midi_out.send(MSG_TEXT, self._sysex.text(text))
 
     def suggest_input_port(self):
         return "OP-1 Midi Device"
@@ -575,58 +537,37 @@ class OP1(ControlSurface):
     def update_display_perform_mode(self):
         self.write_text("perform\rmode")
 
-    def reset_display_clips(self):
-        count = 0
-        colors = []
-        length = []
-        sequence = ()
-
-        for i in range(consts.NUM_TRACKS):
-            count += 1
-
-            colors.append(0x00)
-            colors.append(0x00)
-            colors.append(0x00)
-
-        length.append(count)
-        sequence = self.text_color_start_sequence + tuple(length) + \
-            tuple(colors) + self.text_end_sequence
-        self._send_midi(sequence)
-
-    def update_display_clips(self):
-        # self.log("UPDATING DISPLAY CLIPS")
-        count = 0
-        colors = []
-        length = []
-        sequence = ()
+    def update_clip_strip_slots(self):
+        # shifting known colors if the session ring scrolled sideways
+        self._clip_strip.set_offsets(self._session._track_offset, self._session._scene_offset)
 
+        # assigning session ring clip slots to the clip strip columns
         tracks_len = len(self.song().tracks) - self._session._track_offset
 
         if (tracks_len > consts.NUM_TRACKS):
             tracks_len = consts.NUM_TRACKS
 
-        for i in range(tracks_len):
-            count += 1
+        slots = []
+        for i in range(consts.NUM_TRACKS):
             clip_slot = self._session.scene(0).clip_slot(i)
+            slots.append(clip_slot._clip_slot if clip_slot is not None else None)
 
-            color = (0x00, 0x00, 0x00)
-            if (clip_slot is not None) and (clip_slot._clip_slot is not None):
-                if clip_slot.has_clip():
-                    clip_color = clip_slot._clip_slot.clip.color
-                    color = (((clip_color >> 16) & 0x000000ff) >> 1,
-                             ((clip_color >> 8) & 0x000000ff) >> 1,
-                             (clip_color & 0x000000ff) >> 1)
+        self._clip_strip.set_slots(slots, max(tracks_len, 0))
 
-            colors += color
+    def update_display_clips(self):
+        # self.log("UPDATING DISPLAY CLIPS")
+        self.update_clip_strip_slots()
+        self._clip_strip.flush()
 
-        length.append(count)
-        sequence = self.text_color_start_sequence + tuple(length) + \
-            tuple(colors) + self.text_end_sequence
-        self._send_midi(sequence)
+    def _send_clip_colors(self, count, colors):
+        # clip strip is resent as a whole when the OP-1 connects
+        if not self.device_connected:
+            return
+        # packing frame straight from the clip strip rgb buffer
+        self._midi_out.send(MSG_COLORS, self._sysex.colors(count, colors))
 
     def update_display_clip_mode(self):
-        txt = self.song().view.selected_scene.name.lower()
-        txt = to_op1_printable(txt)
+        txt = self._names.format(self.song().view.selected_scene.name)
         self.write_text("sel. scene\r" + txt)
 
     def get_quant_str(self, q):
@@ -649,64 +590,51 @@ class OP1(ControlSurface):
         return qmap[q] if q in qmap else ":("
 
     def update_display_transport_mode(self):
-        song_time = str(self.song().get_current_beats_song_time())
-        playing = '>' if self.song().is_playing else ''
-        record = '*' if self.song().record_mode else ''
-        txt = playing + record
-        txt += " " + self.get_quant_str(self.song().clip_trigger_quantization)
-        txt += " " + str("%.2f" % round(self.song().tempo, 2))
-        txt += "\r" + song_time[:len(song_time) - 4]
-        self.write_text(txt)
+        self.write_text(self._song_state.transport_text())
 
     def update_display_mixer_mode(self):
-        txt = self.song().view.selected_track.name.lower()
-        txt = to_op1_printable(txt)
+        txt = self._names.format(self.song().view.selected_track.name)
         self.write_text("sel. track\r" + txt)
 
     def update_display(self):
-        if not(self.device_connected):
-            if (self.retries_count < 5):
-                self.log("TRYING OP-1 CONNECTION")
-                self.retries_count += 1
-                self._send_midi(self.id_sequence)
-                time.sleep(1)
-
-        # if in transport mode, update display with song position
-        if (self._operation_mode_selector.mode_index == consts.OP1_MODE_TRANSPORT):
-            self.update_display_transport_mode()
+        if self._trace is not None:
+            self._trace.record(RECORD_TICK)
+
+        # starting a new outbound midi budget, sending queued messages first
+        self._midi_out.tick()
 
-        # checking if app current view is session
-        if (self.app.view.is_view_visible("Session")):
-            # checking if session browser state is diferent from the internal
-            if (self.session_browser_visible != self.app.view.is_view_visible("Browser")):
-                self.session_browser_visible = self.app.view.is_view_visible("Browser")
+        # advancing connection handshake (identity retries and keep-alive)
+        self._handshake.tick()
 
-        # checking if app current view is arrange
-        if (self.app.view.is_view_visible("Arranger")):
-            # checking if arrange browser state is diferent from the internal
-            if (self.arrange_browser_visible != self.app.view.is_view_visible("Browser")):
-                self.arrange_browser_visible = self.app.view.is_view_visible("Browser")
+        # sending clip colors that changed since last tick
+        self._clip_strip.flush()
 
-        # checking if app current view is detail
-        if (self.app.view.is_view_visible("Detail")):
-            # checking if detail state is diferent from the internal
-            if (self.detail_visible != self.app.view.is_view_visible("Detail")):
-                self.detail_visible = self.app.view.is_view_visible("Detail")
+        # rebinding strip controls if track selection settled
+        self._strip_settle.tick()
+
+        # applying transport encoder turns of last tick
+        for encoder in self._transport_encoders:
+            encoder.flush()
+
+        # if in transport mode, update display when song position or state changed
+        if (self._operation_mode_selector.mode_index == consts.OP1_MODE_TRANSPORT):
+            if self._song_state.refresh():
+                self.update_display_transport_mode()
 
     def refresh_state(self):
         self.log("REFRESH STATE")
-        self.retries_count = 0
         self.device_connected = False
+        self._handshake.reset()
+        self._display.invalidate()
 
     def build_midi_map(self, midi_map_handle):
         self._current_midi_map = midi_map_handle
         ControlSurface.build_midi_map(self, midi_map_handle)
 
-        # remove clip listeners
-        self.rem_clip_slot_listeners()
-
-        # add clip listeners
-        self.add_clip_slot_listeners()
+        # add and remove clip listeners for tracks and scenes that changed
+        touched = self._clip_listeners.sync()
+        if touched > 0:
+            self.log("CLIP LISTENERS UPDATED: " + str(touched))
 
         # update display
         self.update_display_clips()
@@ -716,10 +644,27 @@ class OP1(ControlSurface):
 
     def disconnect(self):
         # removing clip slots listeners
-        self.rem_clip_slot_listeners()
+        self._clip_listeners.disconnect()
+
+        # removing song state listeners
+        self._song_state.disconnect()
+
+        # removing track state listeners
+        self._track_states.disconnect()
+
+        # removing view state listeners
+        if self._view_state is not None:
+            self._view_state.disconnect()
+
+        # removing name listeners
+        self._track_name.disconnect()
+        self._scene_name.disconnect()
 
         # removing value listener for track changed
         self.song().view.remove_selected_track_listener(self.selected_track_changed)
+        self._strip_settle.cancel()
+        self.log("STRIP REBINDS: %d (%d skipped while scrolling)" %
+                 (self._strip_settle.fired, self._strip_settle.skipped))
 
         # removing value listener for scene changed
         self.song().view.remove_selected_scene_listener(self.selected_scene_changed)
@@ -728,7 +673,6 @@ class OP1(ControlSurface):
         self._operation_mode_selector.remove_mode_index_listener(self.mode_index_changed)
 
         # removing global transport assignments
-        self._transport.set_punch_buttons(None, None)
         self._transport.set_loop_button(None)
         self._transport.set_overdub_button(None)
         self._transport.set_record_button(None)
@@ -741,16 +685,31 @@ class OP1(ControlSurface):
         self._session.set_scene_bank_buttons(None, None)
 
         # removing misc listeners
-        self.browser_toggle_button.remove_value_listener(self.browser_toggle_button_callback)
         self.mainview_toggle_button.remove_value_listener(self.mainview_toggle_button_callback)
         self.detailview_toggle_button.remove_value_listener(self.detailview_toggle_button_callback)
         self.clear_track_button.remove_value_listener(self.clear_track_button_callback)
         self.back_to_arranger_button.remove_value_listener(self.back_to_arranger_button_callback)
-
-        # sending special ableton mode disable sequence
-        self._send_midi(self.disable_sequence)
+        if self._profiler is not None:
+            self._encoder_1_push.remove_value_listener(self.e1_push_callback)
+            self.log_profile()
+
+        self.log("CONTROLS ALLOCATED: %d (%d requests)" %
+                 (self._control_pool.allocations, self._control_pool.requests))
+        self.log("NAME CACHE: %d hits, %d misses (%d names)" %
+                 (self._names.hits, self._names.misses, len(self._names)))
+
+        # sending special ableton mode disable sequence, queued display frames are dropped
+        self._midi_out.clear()
+        self._midi_out.send(MSG_DISABLE, self.disable_sequence)
+        self._midi_out.drain()
+        self.log("MIDI OUT: " + self._midi_out.summary())
+        self.log("DISPLAY: " + self._display.summary())
+        self.log("CLIP STRIP: " + self._clip_strip.summary())
 
         # disconnecting control surface
         ControlSurface.disconnect(self)
 
+        # closing midi trace, after the disable sequence was recorded
+        self.stop_trace()
+
         self.log("DISCONNECTED")
@@ -0,0 +1,320 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+import abc
+import weakref
+
+from OP1LiveUtils import liveobj_valid
+
+
+class _HasClipCallback(object):
+    """has clip listener of one clip slot, also remembering the clip whose
+    color is observed. Holds the registry weakly so Live's listener lists
+    never keep a disconnected surface alive."""
+
+    __slots__ = ('_registry', 'clip_slot', 'clip')
+
+    def __init__(self, registry, clip_slot):
+        self._registry = weakref.ref(registry)
+        self.clip_slot = clip_slot
+        self.clip = None
+
+    def __call__(self):
+        registry = self._registry()
+        if registry is not None:
+            registry._on_has_clip_changed(self)
+
+
+class _ClipSlotsCallback(object):
+    """clip slots listener of one track."""
+
+    __slots__ = ('_registry', 'track')
+
+    def __init__(self, registry, track):
+        self._registry = weakref.ref(registry)
+        self.track = track
+
+    def __call__(self):
+        registry = self._registry()
+        if registry is not None:
+            registry._dirty_tracks.add(self.track)
+
+
+class _ColorCallback(object):
+    """color listener of one clip, reporting the clip slot it lives in."""
+
+    __slots__ = ('_registry', 'clip_slot')
+
+    def __init__(self, registry, clip_slot):
+        self._registry = weakref.ref(registry)
+        self.clip_slot = clip_slot
+
+    def __call__(self):
+        registry = self._registry()
+        if registry is not None:
+            registry._clip_slot_changed(self.clip_slot)
+
+
+class OP1ListenerStore(object):
+    """Live object -> callback holder map for one kind of listener.
+    Entries are evicted as soon as they are unsubscribed, whether or not the
+    Live object is still alive."""
+
+    def __init__(self, listener_name):
+        self._add_name = 'add_' + listener_name + '_listener'
+        self._remove_name = 'remove_' + listener_name + '_listener'
+        self._has_name = listener_name + '_has_listener'
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, subject):
+        return subject in self._entries
+
+    def get(self, subject):
+        return self._entries.get(subject)
+
+    def subscribe(self, subject, callback):
+        if subject in self._entries:
+            return 0
+        getattr(subject, self._add_name)(callback)
+        self._entries[subject] = callback
+        return 1
+
+    def unsubscribe(self, subject):
+        callback = self._entries.pop(subject, None)
+
+        # deleted objects have already dropped their listeners
+        if (callback is not None) and liveobj_valid(subject):
+            if getattr(subject, self._has_name)(callback):
+                getattr(subject, self._remove_name)(callback)
+                return 1
+        return 0
+
+    def clear(self):
+        touched = 0
+        for subject in list(self._entries):
+            touched += self.unsubscribe(subject)
+        return touched
+
+
+class OP1ClipListenerRegistry(object):
+    """Base for the clip listener registries: keeps has clip listeners on a
+    set of clip slots and color listeners on their clips, and reports every
+    change through clip_slot_changed(clip_slot)."""
+
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self, clip_slot_changed):
+        # callback receiving the clip slot whose clip or color changed
+        self._clip_slot_changed = clip_slot_changed
+
+        self.slot_callbacks = OP1ListenerStore('has_clip')
+        self.clip_color_callbacks = OP1ListenerStore('color')
+
+        # number of Live listeners added or removed by the last sync
+        self.touched = 0
+
+    @abc.abstractmethod
+    def sync(self):
+        """Adds and removes listeners for the clip slots that changed.
+        Returns the number of Live listeners touched."""
+
+    def disconnect(self):
+        self.clip_color_callbacks.clear()
+        self.slot_callbacks.clear()
+
+    def _add_slot_listener(self, cs):
+        # if we already have a has clip listener for this clip slot
+        if cs in self.slot_callbacks:
+            return 0
+
+        callback = _HasClipCallback(self, cs)
+        touched = self.slot_callbacks.subscribe(cs, callback)
+
+        # if clip slot has clip, adding clip listeners
+        if cs.has_clip:
+            touched += self._set_clip(callback, cs.clip)
+        return touched
+
+    def _remove_slot_listener(self, cs):
+        touched = 0
+        callback = self.slot_callbacks.get(cs)
+
+        if callback is not None:
+            touched += self._set_clip(callback, None)
+            touched += self.slot_callbacks.unsubscribe(cs)
+        return touched
+
+    def _set_clip(self, callback, clip):
+        # moving color listener from the previous clip of the slot to the new one
+        touched = 0
+        if callback.clip is not None:
+            touched += self.clip_color_callbacks.unsubscribe(callback.clip)
+        callback.clip = clip
+        if clip is not None:
+            touched += self.clip_color_callbacks.subscribe(
+                clip, _ColorCallback(self, callback.clip_slot))
+        return touched
+
+    def _on_has_clip_changed(self, callback):
+        cs = callback.clip_slot
+
+        # has clip changed, so the slot now holds another clip or none
+        self._set_clip(callback, cs.clip if cs.has_clip else None)
+        self._clip_slot_changed(cs)
+
+
+class OP1ClipSlotRegistry(OP1ClipListenerRegistry):
+    """Observes every clip slot of the song without walking the whole song
+    on every rebuild.
+
+    Track, scene and per track clip slot list changes only mark what needs
+    to be looked at, sync() then adds and removes the listener deltas."""
+
+    def __init__(self, song, clip_slot_changed):
+        OP1ClipListenerRegistry.__init__(self, clip_slot_changed)
+        self._song = song
+
+        # clip slots currently observed for each track
+        self._track_slots = {}
+        self._track_callbacks = {}
+
+        self._tracks_dirty = True
+        self._dirty_tracks = set()
+
+        self._song.add_tracks_listener(self._on_tracks_changed)
+        self._song.add_scenes_listener(self._on_scenes_changed)
+
+    def disconnect(self):
+        self._song.remove_tracks_listener(self._on_tracks_changed)
+        self._song.remove_scenes_listener(self._on_scenes_changed)
+
+        for track in list(self._track_slots):
+            self._release_track(track)
+        OP1ClipListenerRegistry.disconnect(self)
+
+    def _on_tracks_changed(self):
+        self._tracks_dirty = True
+
+    def _on_scenes_changed(self):
+        # every track gains or loses a clip slot
+        self._dirty_tracks.update(self._track_slots)
+
+    def sync(self):
+        touched = 0
+
+        if self._tracks_dirty:
+            self._tracks_dirty = False
+            tracks = self._song.tracks
+
+            # releasing tracks that were deleted
+            current = set(tracks)
+            for track in list(self._track_slots):
+                if track not in current:
+                    touched += self._release_track(track)
+
+            # observing tracks that were added
+            for track in tracks:
+                if track not in self._track_slots:
+                    callback = _ClipSlotsCallback(self, track)
+                    track.add_clip_slots_listener(callback)
+                    self._track_callbacks[track] = callback
+                    self._track_slots[track] = ()
+                    self._dirty_tracks.add(track)
+
+        # applying clip slot deltas of the tracks that changed
+        for track in self._dirty_tracks:
+            if track in self._track_slots:
+                touched += self._sync_track(track)
+        self._dirty_tracks.clear()
+
+        self.touched = touched
+        return touched
+
+    def _sync_track(self, track):
+        touched = 0
+        old_slots = self._track_slots[track]
+        new_slots = track.clip_slots
+
+        new_set = set(new_slots)
+        for cs in old_slots:
+            if cs not in new_set:
+                touched += self._remove_slot_listener(cs)
+
+        old_set = set(old_slots)
+        for cs in new_slots:
+            if cs not in old_set:
+                touched += self._add_slot_listener(cs)
+
+        self._track_slots[track] = new_slots
+        return touched
+
+    def _release_track(self, track):
+        touched = 0
+        for cs in self._track_slots.pop(track):
+            touched += self._remove_slot_listener(cs)
+
+        callback = self._track_callbacks.pop(track)
+        if liveobj_valid(track) and track.clip_slots_has_listener(callback):
+            track.remove_clip_slots_listener(callback)
+        return touched
+
+
+class OP1SessionRingRegistry(OP1ClipListenerRegistry):
+    """Only observes the clip slots currently inside the session ring, so
+    the number of listeners does not depend on the size of the set.
+    sync() re-targets the listeners after the ring moved."""
+
+    def __init__(self, session, num_tracks, clip_slot_changed):
+        OP1ClipListenerRegistry.__init__(self, clip_slot_changed)
+        self._session = session
+        self._num_tracks = num_tracks
+
+        # clip slots currently observed, by ring column
+        self._ring_slots = ()
+
+    def sync(self):
+        touched = 0
+        scene = self._session.scene(0)
+
+        ring_slots = []
+        for i in range(self._num_tracks):
+            cs = scene.clip_slot(i)._clip_slot
+            if cs is not None:
+                ring_slots.append(cs)
+
+        # removing listeners of slots that left the ring
+        new_set = set(ring_slots)
+        for cs in self._ring_slots:
+            if cs not in new_set:
+                touched += self._remove_slot_listener(cs)
+
+        # adding listeners to slots that entered it
+        for cs in ring_slots:
+            touched += self._add_slot_listener(cs)
+
+        self._ring_slots = tuple(ring_slots)
+        self.touched = touched
+        return touched
+
+    def disconnect(self):
+        OP1ClipListenerRegistry.disconnect(self)
+        self._ring_slots = ()
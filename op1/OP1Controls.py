@@ -0,0 +1,71 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+import Live
+import consts
+
+# Ableton Live imports
+
+from _Framework.ButtonElement import ButtonElement
+from _Framework.EncoderElement import EncoderElement
+from _Framework.InputControlElement import MIDI_CC_TYPE
+
+
+class OP1ControlPool(object):
+    """Creates each physical OP-1 control once and hands out the same
+    element to everyone asking for it, so mode switches and track changes
+    never allocate new elements or grow the MIDI map."""
+
+    def __init__(self, channel=consts.CHANNEL):
+        self._channel = channel
+
+        # (message type, identifier) -> control element
+        self._controls = {}
+
+        self.allocations = 0
+        self.requests = 0
+
+    def button(self, identifier, msg_type=MIDI_CC_TYPE, is_momentary=True):
+        self.requests += 1
+        key = (msg_type, identifier)
+        control = self._controls.get(key)
+
+        if control is None:
+            control = ButtonElement(is_momentary, msg_type, self._channel, identifier)
+            self._controls[key] = control
+            self.allocations += 1
+        return control
+
+    def buttons(self, identifiers, msg_type=MIDI_CC_TYPE, is_momentary=True):
+        return [self.button(identifier, msg_type, is_momentary) for identifier in identifiers]
+
+    def encoder(self, identifier,
+                map_mode=Live.MidiMap.MapMode.relative_two_compliment):
+        self.requests += 1
+        key = (MIDI_CC_TYPE, identifier)
+        control = self._controls.get(key)
+
+        if control is None:
+            control = EncoderElement(MIDI_CC_TYPE, self._channel, identifier, map_mode)
+            self._controls[key] = control
+            self.allocations += 1
+        return control
+
+    def __len__(self):
+        return len(self._controls)
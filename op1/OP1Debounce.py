@@ -0,0 +1,63 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+
+class OP1SettleTimer(object):
+    """Runs callback once a burst of triggers has settled, that is after
+    settle_ticks display ticks without a new trigger. Triggers arriving
+    while one is pending only restart the count and are counted as skipped.
+    With settle_ticks of 0 the callback runs right away on every trigger."""
+
+    def __init__(self, settle_ticks, callback):
+        self._settle_ticks = settle_ticks
+        self._callback = callback
+        self._remaining = None
+
+        self.fired = 0
+        self.skipped = 0
+
+    def trigger(self):
+        if self._settle_ticks <= 0:
+            self._fire()
+            return
+
+        if self._remaining is not None:
+            self.skipped += 1
+        self._remaining = self._settle_ticks
+
+    def tick(self):
+        if self._remaining is None:
+            return
+
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self._fire()
+
+    def flush(self):
+        # running a pending callback now, e.g. before state depending on it is used
+        if self._remaining is not None:
+            self._fire()
+
+    def cancel(self):
+        self._remaining = None
+
+    def _fire(self):
+        self._remaining = None
+        self.fired += 1
+        self._callback()
@@ -0,0 +1,71 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+
+# Layers of a dispatch table, the base layer is always at the bottom of the stack
+
+LAYER_BASE = 0
+LAYER_SHIFT = 1
+
+
+class OP1DispatchTable(object):
+    """Resolves incoming control values to their handler in constant time.
+
+    Handlers are registered per (mode, layer, control identifier) together
+    with the index of the control in its row of keys. Activating a mode or
+    pushing and popping a layer only swaps the table used by dispatch(), so
+    no Live listener is touched and an event costs a single dict lookup."""
+
+    def __init__(self):
+        self._tables = {}
+        self._active = {}
+        self._layers = [LAYER_BASE]
+        self.active_mode = None
+
+    def register(self, mode, identifier, handler, index=None, layer=LAYER_BASE):
+        self._tables.setdefault((mode, layer), {})[identifier] = (handler, index)
+
+    def activate(self, mode):
+        self.active_mode = mode
+        self._select()
+
+    def push_layer(self, layer):
+        # ignoring repeated presses of an already active modifier
+        if layer not in self._layers:
+            self._layers.append(layer)
+            self._select()
+
+    def pop_layer(self, layer):
+        if layer != LAYER_BASE and layer in self._layers:
+            self._layers.remove(layer)
+            self._select()
+
+    def _select(self):
+        self._active = self._tables.get((self.active_mode, self._layers[-1]), {})
+
+    def dispatch(self, value, sender):
+        entry = self._active.get(sender.message_identifier())
+        if entry is not None:
+            handler, index = entry
+            if index is None:
+                handler(value)
+            else:
+                handler(value, index)
+            return True
+        return False
@@ -0,0 +1,203 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+from OP1LiveUtils import liveobj_valid
+
+# line separator used by the OP-1 text sysex message
+LINE_SEPARATOR = '\r'
+
+NUM_LINES = 2
+
+
+class OP1DisplayCompositor(object):
+    """Framebuffer for the two text lines of the OP-1 display.
+    Text is only sent to the device when a line actually changes."""
+
+    def __init__(self, send_text):
+        # callback that sends the rendered text to the OP-1
+        self._send_text = send_text
+
+        # None means that the line was never written (or has no content)
+        self._lines = [None] * NUM_LINES
+        self._dirty = [True] * NUM_LINES
+
+        self.frames_sent = 0
+        self.frames_suppressed = 0
+
+    def set_line(self, index, text):
+        # marking line as dirty only if its content changed
+        if self._lines[index] != text:
+            self._lines[index] = text
+            self._dirty[index] = True
+
+    def write(self, msg):
+        # splitting message into top and bottom line
+        lines = msg.strip().split(LINE_SEPARATOR, 1)
+
+        self.set_line(0, lines[0])
+        self.set_line(1, lines[1] if len(lines) > 1 else None)
+
+        self.flush()
+
+    def flush(self):
+        # nothing changed since last frame, skip it
+        if not (True in self._dirty):
+            self.frames_suppressed += 1
+            return
+
+        self._dirty = [False] * NUM_LINES
+        self.frames_sent += 1
+        self._send_text(self.render())
+
+    def render(self):
+        top, bottom = self._lines
+        if bottom is None:
+            return top or ''
+        return (top or '') + LINE_SEPARATOR + bottom
+
+    def invalidate(self):
+        # forcing next flush to send the whole frame (e.g. after reconnect)
+        self._dirty = [True] * NUM_LINES
+
+    def summary(self):
+        return "%d frames sent, %d suppressed" % (self.frames_sent, self.frames_suppressed)
+
+
+class OP1ClipStrip(object):
+    """Colors of the clip slots shown on the OP-1, one column per track of
+    the session ring, kept as rgb triples in a flat bytearray.
+
+    Clip slot events only mark their column dirty. flush() is meant to be
+    called once per display tick: it re-reads the dirty columns in place and
+    sends a single frame if any color actually changed. When the ring moves
+    sideways the known columns are shifted, so only the columns that
+    scrolled in are read from Live."""
+
+    def __init__(self, num_columns, send_colors):
+        # callback sending (count, colors array) to the OP-1
+        self._send_colors = send_colors
+
+        self._num_columns = num_columns
+        self._slots = [None] * num_columns
+        self._columns = {}
+        self._colors = bytearray(3 * num_columns)
+        self._count = 0
+        self._offsets = None
+
+        self._dirty = set(range(num_columns))
+        self._frame_dirty = True
+
+        self.events = 0
+        self.events_coalesced = 0
+        self.events_ignored = 0
+        self.columns_refreshed = 0
+        self.columns_shifted = 0
+        self.frames_sent = 0
+
+    def set_offsets(self, track_offset, scene_offset):
+        # reusing known columns when the session ring only moved sideways
+        offsets = (track_offset, scene_offset)
+        if self._offsets is not None and self._offsets[1] == scene_offset:
+            self.shift(track_offset - self._offsets[0])
+        self._offsets = offsets
+
+    def shift(self, delta):
+        n = self._num_columns
+        if delta == 0 or abs(delta) >= n:
+            return
+
+        colors = self._colors
+        if delta > 0:
+            colors[0:3 * (n - delta)] = colors[3 * delta:]
+            self._slots[0:n - delta] = self._slots[delta:]
+            self._dirty = set(c - delta for c in self._dirty if c >= delta)
+        else:
+            colors[-3 * delta:] = colors[:3 * (n + delta)]
+            self._slots[-delta:] = self._slots[:n + delta]
+            self._dirty = set(c - delta for c in self._dirty if c < n + delta)
+
+        self.columns_shifted += n - abs(delta)
+        self._frame_dirty = True
+
+    def set_slots(self, slots, count):
+        # assigning the clip slots currently in the session ring
+        for i in range(self._num_columns):
+            cs = slots[i] if i < len(slots) else None
+            old = self._slots[i]
+            if (cs is None) != (old is None) or (cs is not None and cs != old):
+                self._slots[i] = cs
+                self._dirty.add(i)
+
+        self._columns = dict((cs, i) for i, cs in enumerate(self._slots) if cs is not None)
+
+        if count != self._count:
+            self._count = count
+            self._frame_dirty = True
+
+    def slot_changed(self, cs):
+        self.events += 1
+        column = self._columns.get(cs)
+
+        if column is None:
+            # slot is not on the OP-1 display
+            self.events_ignored += 1
+        elif column in self._dirty:
+            # already waiting for next flush
+            self.events_coalesced += 1
+        else:
+            self._dirty.add(column)
+
+    def invalidate(self):
+        self._dirty.update(range(self._num_columns))
+        self._frame_dirty = True
+
+    def flush(self):
+        if self._dirty:
+            colors = self._colors
+            for column in self._dirty:
+                cs = self._slots[column]
+                if (cs is not None) and liveobj_valid(cs) and cs.has_clip:
+                    clip_color = cs.clip.color
+                else:
+                    clip_color = 0
+
+                # OP-1 takes 7 bit rgb components
+                i = 3 * column
+                r = ((clip_color >> 16) & 0xff) >> 1
+                g = ((clip_color >> 8) & 0xff) >> 1
+                b = (clip_color & 0xff) >> 1
+                if colors[i] != r or colors[i + 1] != g or colors[i + 2] != b:
+                    colors[i] = r
+                    colors[i + 1] = g
+                    colors[i + 2] = b
+                    self._frame_dirty = True
+
+            self.columns_refreshed += len(self._dirty)
+            self._dirty.clear()
+
+        if self._frame_dirty:
+            self._frame_dirty = False
+            self.frames_sent += 1
+            self._send_colors(self._count, self._colors)
+
+    def summary(self):
+        return ("%d events (%d coalesced, %d ignored), %d columns refreshed, %d shifted, "
+                "%d frames sent" % (self.events, self.events_coalesced, self.events_ignored,
+                                    self.columns_refreshed, self.columns_shifted,
+                                    self.frames_sent))
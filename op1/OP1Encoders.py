@@ -0,0 +1,65 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+import consts
+
+
+def relative_steps(value, step_size=consts.ENCODER_STEP_SIZE):
+    # decoding relative two's complement value (1..63 up, 65..127 down)
+    delta = value if value < 64 else value - 128
+    if delta == 0:
+        return 0
+
+    # every message moves at least one step, bigger values move more
+    steps = max(1, abs(delta) // step_size)
+    return steps if delta > 0 else -steps
+
+
+def accelerate(steps):
+    # steps beyond the threshold of one tick count several times
+    n = abs(steps)
+    if n > consts.ENCODER_ACCEL_THRESHOLD:
+        n += (n - consts.ENCODER_ACCEL_THRESHOLD) * (consts.ENCODER_ACCEL_FACTOR - 1)
+    return n if steps > 0 else -n
+
+
+class OP1EncoderAccumulator(object):
+    """Sums the relative messages of one encoder between display ticks.
+    flush() hands the signed (optionally accelerated) number of steps of
+    the tick to apply_steps, so a fast turn is handled once per tick."""
+
+    def __init__(self, apply_steps, acceleration=False):
+        # callback receiving the signed number of steps of one tick
+        self._apply_steps = apply_steps
+        self._acceleration = acceleration
+        self._steps = 0
+
+    def add(self, value):
+        self._steps += relative_steps(value)
+
+    def flush(self):
+        steps = self._steps
+        if steps == 0:
+            return
+
+        self._steps = 0
+        if self._acceleration:
+            steps = accelerate(steps)
+
+        self._apply_steps(steps)
@@ -0,0 +1,103 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+import consts
+
+# Handshake states
+
+STATE_PROBING = 0
+STATE_CONNECTED = 1
+
+
+class OP1Handshake(object):
+    """Connection state machine for the OP-1, advanced by counting display
+    ticks so that it never blocks Live's UI thread.
+
+    While probing, identity requests are retried with exponential backoff
+    and stop after HANDSHAKE_MAX_RETRIES attempts until the next reset() or
+    identity reply. Once connected, a keep-alive identity request is sent periodically and a
+    missing reply moves the state machine back to probing."""
+
+    def __init__(self, send_identity_request, on_connected, on_disconnected):
+        self._send_identity_request = send_identity_request
+        self._on_connected = on_connected
+        self._on_disconnected = on_disconnected
+
+        self._ticks = 0
+        self.state = STATE_PROBING
+        self.retries_count = 0
+
+        self._retry_interval = consts.HANDSHAKE_RETRY_TICKS
+        self._next_request_tick = 0
+        self._ping_sent_tick = None
+
+    @property
+    def connected(self):
+        return self.state == STATE_CONNECTED
+
+    @property
+    def retries_exhausted(self):
+        probing = (self.state == STATE_PROBING)
+        return probing and (self.retries_count >= consts.HANDSHAKE_MAX_RETRIES)
+
+    def reset(self):
+        # starting over with a fresh probe on next tick
+        self.state = STATE_PROBING
+        self.retries_count = 0
+        self._retry_interval = consts.HANDSHAKE_RETRY_TICKS
+        self._next_request_tick = self._ticks
+        self._ping_sent_tick = None
+
+    def tick(self):
+        self._ticks += 1
+
+        if self.state == STATE_PROBING:
+            # no OP-1 answered, staying quiet until reset
+            if self.retries_exhausted:
+                return
+
+            if self._ticks >= self._next_request_tick:
+                self.retries_count += 1
+                self._send_identity_request()
+
+                # doubling the wait before next attempt, up to a limit
+                self._next_request_tick = self._ticks + self._retry_interval
+                self._retry_interval = min(self._retry_interval * 2,
+                                           consts.HANDSHAKE_MAX_RETRY_TICKS)
+
+        elif self._ping_sent_tick is not None:
+            # keep-alive was sent, checking if OP-1 answered in time
+            if self._ticks - self._ping_sent_tick > consts.HANDSHAKE_KEEPALIVE_TIMEOUT_TICKS:
+                self.reset()
+                self._on_disconnected()
+
+        elif self._ticks >= self._next_request_tick:
+            # sending keep-alive identity request
+            self._ping_sent_tick = self._ticks
+            self._send_identity_request()
+
+    def identity_received(self):
+        self._ping_sent_tick = None
+        self._next_request_tick = self._ticks + consts.HANDSHAKE_KEEPALIVE_TICKS
+
+        if self.state != STATE_CONNECTED:
+            self.state = STATE_CONNECTED
+            self.retries_count = 0
+            self._retry_interval = consts.HANDSHAKE_RETRY_TICKS
+            self._on_connected()
@@ -0,0 +1,122 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+import consts
+
+# Kinds of outbound messages
+
+MSG_IDENTITY = 'identity'
+MSG_ENABLE = 'enable'
+MSG_DISABLE = 'disable'
+MSG_TEXT = 'text'
+MSG_COLORS = 'colors'
+
+# Priority of each kind, lower is sent first: handshake > text > clip colors
+
+PRIORITIES = {
+    MSG_IDENTITY: 0,
+    MSG_ENABLE: 0,
+    MSG_DISABLE: 0,
+    MSG_TEXT: 1,
+    MSG_COLORS: 2,
+}
+
+
+class OP1MidiQueue(object):
+    """Outbound midi scheduler with a bytes per display tick budget.
+
+    A message is sent right away when it fits in what is left of the
+    budget and nothing of the same or higher priority is waiting. Otherwise
+    it is queued, replacing any queued message of the same kind since only
+    the latest text or color frame matters, and sent on a later tick in
+    priority order. A single message larger than the whole budget is sent
+    alone on a tick of its own."""
+
+    def __init__(self, send_midi, budget=consts.MIDI_OUT_BYTES_PER_TICK):
+        self._send_midi = send_midi
+        self._budget = budget
+        self._used = 0
+
+        # kind -> (priority, sequence, midi bytes)
+        self._pending = {}
+        self._sequence = 0
+
+        # kind -> [frames, bytes, superseded, deferred]
+        self._counters = dict((kind, [0, 0, 0, 0]) for kind in PRIORITIES)
+
+    def send(self, kind, midi_bytes):
+        priority = PRIORITIES[kind]
+
+        if kind in self._pending:
+            self._counters[kind][2] += 1
+        elif self._fits(midi_bytes) and not self._waiting(priority):
+            self._write(kind, midi_bytes)
+            return
+        else:
+            self._counters[kind][3] += 1
+
+        self._sequence += 1
+        self._pending[kind] = (priority, self._sequence, midi_bytes)
+
+    def tick(self):
+        # starting a new budget, queued messages go first
+        self._used = 0
+        if self._pending:
+            for kind in self._queued_kinds():
+                midi_bytes = self._pending[kind][2]
+                if not self._fits(midi_bytes):
+                    break
+                del self._pending[kind]
+                self._write(kind, midi_bytes)
+
+    def drain(self):
+        # sending everything queued regardless of the budget (e.g. on disconnect)
+        for kind in self._queued_kinds():
+            self._write(kind, self._pending.pop(kind)[2])
+
+    def clear(self):
+        self._pending.clear()
+
+    def _queued_kinds(self):
+        return sorted(self._pending, key=self._pending.get)
+
+    def _waiting(self, priority):
+        for (queued_priority, _, _) in self._pending.values():
+            if queued_priority <= priority:
+                return True
+        return False
+
+    def _fits(self, midi_bytes):
+        return (self._used == 0) or (self._used + len(midi_bytes) <= self._budget)
+
+    def _write(self, kind, midi_bytes):
+        self._used += len(midi_bytes)
+        counters = self._counters[kind]
+        counters[0] += 1
+        counters[1] += len(midi_bytes)
+        self._send_midi(midi_bytes)
+
+    def __len__(self):
+        return len(self._pending)
+
+    def summary(self):
+        return ', '.join("%s %d frames %d bytes (%d superseded, %d deferred)" %
+                         ((kind,) + tuple(self._counters[kind]))
+                         for kind in sorted(PRIORITIES, key=lambda k: (PRIORITIES[k], k))
+                         if self._counters[kind][0] or self._counters[kind][2])
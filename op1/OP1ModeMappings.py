@@ -0,0 +1,182 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+# Declarative description of what every OP-1 mode binds.
+#
+# Each mode lists:
+#   'strip'     - which controls go to the selected channel strip
+#   'setters'   - component setter -> controls passed to it. Setters that a
+#                 mode does not list are called with None when it is entered
+#   'listeners' - (control, handler, identify sender) value listeners
+#
+# Controls are attribute names of OP1ModeSelectorComponent, (name, index) for
+# an element of a list attribute, or (name, ALL) for the whole list as a tuple.
+# Setter targets are 'session', 'mixer', 'transport', 'scene' (session scene 0)
+# or ('clip_slot', index) of session scene 0. Handlers are method names of the
+# mode selector, or 'parent.<name>' for methods of the OP1 control surface.
+
+import consts
+
+ALL = None
+
+# channel strip profiles
+
+STRIP_NONE = 0
+STRIP_BUTTONS = 1   # solo, arm and mute
+STRIP_FULL = 2      # solo, arm, mute, volume, pan and sends
+
+# channel strip setters, in binding order, with the value releasing them
+STRIP_SETTERS = (
+    ('set_solo_button', None),
+    ('set_arm_button', None),
+    ('set_mute_button', None),
+    ('set_volume_control', None),
+    ('set_pan_control', None),
+    ('set_send_controls', (None, None)),
+)
+
+NOTE_KEYS = [('note_keys_buttons', i) for i in range(consts.NUM_TRACKS)]
+NOTE_KEYS_SHIFTED = [('note_keys_shifted_buttons', i) for i in range(consts.NUM_TRACKS)]
+
+SCENE_BANK_BUTTONS = (('session', 'set_scene_bank_buttons'), ('_com_button', '_micro_button'))
+
+MODE_MAPPINGS = {
+    consts.OP1_MODE_PERFORM: {
+        'name': 'PERFORM',
+        'strip': STRIP_FULL,
+        'setters': dict([
+            SCENE_BANK_BUTTONS,
+        ]),
+        'listeners': [],
+    },
+
+    consts.OP1_MODE_CLIP: {
+        'name': 'CLIP',
+        'strip': STRIP_FULL,
+        'setters': dict([
+            SCENE_BANK_BUTTONS,
+            (('session', 'set_track_bank_buttons'), ('_right_arrow_button', '_left_arrow_button')),
+            (('session', 'set_stop_all_clips_button'), ('_stop_all_clips_button',)),
+            (('session', 'set_stop_track_clip_buttons'), (('note_keys_shifted_buttons', ALL),)),
+            (('scene', 'set_launch_button'), (('note_keys_buttons', consts.NUM_TRACKS),)),
+        ] + [
+            ((('clip_slot', i), 'set_launch_button'), (NOTE_KEYS[i],))
+            for i in range(consts.NUM_TRACKS)
+        ]),
+        'listeners': [],
+    },
+
+    consts.OP1_MODE_TRANSPORT: {
+        'name': 'TRANSPORT',
+        'strip': STRIP_BUTTONS,
+        'setters': {},
+        'listeners': [
+            ('_left_arrow_button', 'layered_button_pressed', True),
+            ('_right_arrow_button', 'layered_button_pressed', True),
+            ('_encoder_1', 'parent.e1_transport_scrub', False),
+            ('_encoder_2', 'parent.e2_transport_scrub', False),
+            ('_encoder_3', 'parent.e3_transport_scroll', False),
+            ('_encoder_4', 'parent.e4_transport_zoom', False),
+            ('_micro_button', 'parent.mic_button_sel_up', False),
+            ('_com_button', 'parent.com_button_sel_down', False),
+        ] + [
+            (key, 'note_key_pressed', True) for key in NOTE_KEYS + NOTE_KEYS_SHIFTED
+        ],
+    },
+
+    consts.OP1_MODE_MIXER: {
+        'name': 'MIXER',
+        'strip': STRIP_FULL,
+        'setters': dict([
+            SCENE_BANK_BUTTONS,
+            (('mixer', 'set_select_buttons'), ('_right_arrow_button', '_left_arrow_button')),
+        ]),
+        'listeners': [
+            (key, 'note_key_pressed', True) for key in NOTE_KEYS
+        ],
+    },
+}
+
+# mapping with nothing bound, used before the first mode and by clear()
+
+EMPTY_MAPPING = {
+    'name': 'NO',
+    'strip': STRIP_NONE,
+    'setters': {},
+    'listeners': [],
+}
+
+
+class OP1CompiledMapping(object):
+    """Mode mapping with every name resolved to the actual objects."""
+
+    __slots__ = ('name', 'strip', 'setters', 'listeners')
+
+    def __init__(self, name, strip, setters, listeners):
+        self.name = name
+        self.strip = strip
+
+        # (component, setter name) -> argument tuple
+        self.setters = setters
+
+        # (control, handler) -> identify sender
+        self.listeners = listeners
+
+
+def compile_mapping(mapping, resolve_control, resolve_target, resolve_handler):
+    setters = {}
+    for (target, setter), controls in mapping['setters'].items():
+        component = resolve_target(target)
+        setters[(component, setter)] = tuple(resolve_control(c) for c in controls)
+
+    listeners = {}
+    for control, handler, identify_sender in mapping['listeners']:
+        listeners[(resolve_control(control), resolve_handler(handler))] = identify_sender
+
+    return OP1CompiledMapping(mapping['name'], mapping['strip'], setters, listeners)
+
+
+def apply_mapping_diff(old, new):
+    """Moves bindings from the old compiled mapping to the new one, only
+    touching setters and listeners whose assignment changes. Returns the
+    number of setter calls plus listener additions and removals."""
+    changes = 0
+
+    # releasing setters that the new mapping does not use
+    for key, args in old.setters.items():
+        if key not in new.setters:
+            getattr(key[0], key[1])(*((None,) * len(args)))
+            changes += 1
+
+    for key, args in new.setters.items():
+        if old.setters.get(key) != args:
+            getattr(key[0], key[1])(*args)
+            changes += 1
+
+    for control, handler in old.listeners:
+        if (control, handler) not in new.listeners:
+            control.remove_value_listener(handler)
+            changes += 1
+
+    for (control, handler), identify_sender in new.listeners.items():
+        if (control, handler) not in old.listeners:
+            control.add_value_listener(handler, identify_sender)
+            changes += 1
+
+    return changes
@@ -18,15 +18,44 @@
 ##################################################################
 
 
-import Live
+import timeit
 import consts
 
 # Ableton Live imports
 
 from _Framework.ModeSelectorComponent import ModeSelectorComponent
-from _Framework.EncoderElement import EncoderElement
-from _Framework.ButtonElement import ButtonElement
-from _Framework.InputControlElement import MIDI_CC_TYPE, MIDI_NOTE_TYPE
+from _Framework.InputControlElement import MIDI_NOTE_TYPE
+
+# OP-1 imports
+
+from OP1TrackIndex import OP1TrackIndex
+from OP1Dispatch import OP1DispatchTable, LAYER_SHIFT
+from OP1ModeMappings import MODE_MAPPINGS, EMPTY_MAPPING, ALL, STRIP_NONE, STRIP_FULL
+from OP1ModeMappings import STRIP_SETTERS
+from OP1ModeMappings import compile_mapping, apply_mapping_diff
+
+# note numbers of the OP-1 keys, with and without shift
+NOTE_KEYS_CCS = [53, 55, 57, 59, 60, 62, 64, 65, 67, 69, 71, 72, 74, 76]
+NOTE_KEYS_SHIFTED_CCS = [77, 79, 81, 83, 84, 86, 88, 89, 91, 93, 95, 96, 98]
+
+# controls only allocated from the pool when a mode using them is first entered:
+# attribute name -> (pool method, identifier(s), extra arguments)
+MODE_CONTROLS = {
+    '_left_arrow_button': ('button', consts.OP1_LEFT_ARROW, ()),
+    '_right_arrow_button': ('button', consts.OP1_RIGHT_ARROW, ()),
+    'note_keys_buttons': ('buttons', NOTE_KEYS_CCS, (MIDI_NOTE_TYPE,)),
+    'note_keys_shifted_buttons': ('buttons', NOTE_KEYS_SHIFTED_CCS, (MIDI_NOTE_TYPE,)),
+    '_stop_all_clips_button': ('button', 100, (MIDI_NOTE_TYPE,)),    # last key note
+    '_ss5_button': ('button', consts.OP1_SS5_BUTTON, ()),
+    '_ss6_button': ('button', consts.OP1_SS6_BUTTON, ()),
+    '_ss7_button': ('button', consts.OP1_SS7_BUTTON, ()),
+    '_micro_button': ('button', consts.OP1_MICRO, ()),
+    '_com_button': ('button', consts.OP1_COM, ()),
+    '_encoder_1': ('encoder', consts.OP1_ENCODER_1, ()),
+    '_encoder_2': ('encoder', consts.OP1_ENCODER_2, ()),
+    '_encoder_3': ('encoder', consts.OP1_ENCODER_3, ()),
+    '_encoder_4': ('encoder', consts.OP1_ENCODER_4, ()),
+}
 
 
 class OP1ModeSelectorComponent(ModeSelectorComponent):
@@ -45,104 +74,76 @@ class OP1ModeSelectorComponent(ModeSelectorComponent):
 
         self._shift_active = False
 
-        # creating buttons for the arrows keys
-        self._left_arrow_button = ButtonElement(True, MIDI_CC_TYPE,
-                                                consts.CHANNEL, consts.OP1_LEFT_ARROW)
-        self._right_arrow_button = ButtonElement(True, MIDI_CC_TYPE,
-                                                 consts.CHANNEL, consts.OP1_RIGHT_ARROW)
+        # flat track list used by mixer mode note keys
+        self._track_index = OP1TrackIndex(self._parent.song(),
+                                          consts.MIXER_KEYS_VISIBLE_TRACKS_ONLY)
 
-        # self._left_arrow_button.add_value_listener(self.left_arrow_pressed)
-        # self._right_arrow_button.add_value_listener(self.right_arrow_pressed)
+        # every control comes from the pool shared with the OP-1 surface
+        controls = self._parent._control_pool
+        self._mode_controls = {}
 
         # creating button for the shift key
-        self._shift_button = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL,
-                                           consts.OP1_SHIFT_BUTTON)
+        self._shift_button = controls.button(consts.OP1_SHIFT_BUTTON)
         self._shift_button.add_value_listener(self.shift_pressed)
 
-        # creating buttons for the note shifted keys
-        self.note_keys_shifted_buttons = []
-        self.note_keys_shifted_ccs = [77, 79, 81, 83, 84, 86, 88, 89, 91, 93, 95, 96, 98]
+        # note key numbers, their buttons are created by the first mode using them
+        self.note_keys_shifted_ccs = NOTE_KEYS_SHIFTED_CCS
+        self.note_keys_ccs = NOTE_KEYS_CCS
 
-        # creating a list of shifted note keys buttons
-        for i in range(len(self.note_keys_shifted_ccs)):
-            self.note_keys_shifted_buttons.append(ButtonElement(
-                True, MIDI_NOTE_TYPE,
-                consts.CHANNEL, self.note_keys_shifted_ccs[i]))
+        # note key handlers for each mode, looked up by note number
+        self._note_keys_dispatch = OP1DispatchTable()
 
-        # creating buttons for the note keys
-        self.note_keys_buttons = []
-        self.note_keys_ccs = [53, 55, 57, 59, 60, 62, 64, 65, 67, 69, 71, 72, 74, 76]
+        for i in range(consts.NUM_TRACKS):
+            note = self.note_keys_ccs[i]
+            self._note_keys_dispatch.register(consts.OP1_MODE_MIXER, note,
+                                              self.select_track_key_pressed, i)
+            self._note_keys_dispatch.register(consts.OP1_MODE_TRANSPORT, note,
+                                              self.loop_key_pressed, i)
 
-        # creating a list of note keys buttons
-        for i in range(len(self.note_keys_ccs)):
-            self.note_keys_buttons.append(ButtonElement(True, MIDI_NOTE_TYPE,
-                                                        consts.CHANNEL, self.note_keys_ccs[i]))
+            note = self.note_keys_shifted_ccs[i]
+            self._note_keys_dispatch.register(consts.OP1_MODE_TRANSPORT, note,
+                                              self.loop_start_key_pressed, i)
 
         # browser toggle only with shift
-        self.lift_button = ButtonElement(False, MIDI_CC_TYPE,
-                                         consts.CHANNEL, consts.OP1_ARROW_UP_BUTTON)
-        self.ss1_button = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS1_BUTTON)
-        self.ss2_button = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS2_BUTTON)
-#       self.lift_button.add_value_listener(self.browser_toggle_button_callback)
-        self._parent._transport.set_punch_buttons(self.ss1_button, self.ss2_button)
+        self.lift_button = controls.button(consts.OP1_ARROW_UP_BUTTON, is_momentary=False)
+        self.ss1_button = controls.button(consts.OP1_SS1_BUTTON)
+        self.ss2_button = controls.button(consts.OP1_SS2_BUTTON)
 
+        # base and shift layer handlers of buttons whose function depends on shift
+        self._buttons_dispatch = OP1DispatchTable()
+        self._lift_cue_enabled = False
 
+        for mode in range(consts.NUM_MODES):
+            # lift only sets cues once shift was released, see shift_pressed
+            self._buttons_dispatch.register(mode, consts.OP1_ARROW_UP_BUTTON,
+                                            self.lift_button_shifted_callback, layer=LAYER_SHIFT)
+            self._register_layers(mode, consts.OP1_SS1_BUTTON,
+                                  self.ss1_punch_in_callback, self.ss1_loop_start_callback)
+            self._register_layers(mode, consts.OP1_SS2_BUTTON,
+                                  self.ss2_punch_out_callback, self.ss2_loop_end_callback)
 
+        # arrows only depend on shift in transport mode, other modes give them to components
+        self._register_layers(consts.OP1_MODE_TRANSPORT, consts.OP1_LEFT_ARROW,
+                              self.left_arrow_pressed, self.shifted_left_arrow_pressed)
+        self._register_layers(consts.OP1_MODE_TRANSPORT, consts.OP1_RIGHT_ARROW,
+                              self.right_arrow_pressed, self.shifted_right_arrow_pressed)
 
+        # layered buttons keep a single listener, shift only swaps the active layer
+        self._layered_buttons = (self.lift_button, self.ss1_button, self.ss2_button)
+        for button in self._layered_buttons:
+            button.add_value_listener(self.layered_button_pressed, True)
 
+        # mappings of every mode are resolved when the mode is first entered,
+        # mode switches then only diff them
+        self._mappings = {}
+        self._empty_mapping = compile_mapping(EMPTY_MAPPING, self._resolve_control,
+                                              self._resolve_target, self._resolve_handler)
+        self._mapping = self._empty_mapping
 
-
-        self._play_button = ButtonElement(True, MIDI_CC_TYPE,
-                                          consts.CHANNEL, consts.OP1_PLAY_BUTTON)
-        self._rec_button = ButtonElement(True, MIDI_CC_TYPE,
-                                         consts.CHANNEL, consts.OP1_REC_BUTTON)
-
-# setting global session assignments
-        self._ss6_button = ButtonElement(True, MIDI_CC_TYPE,
-                                         consts.CHANNEL, consts.OP1_SS6_BUTTON)
-        self._micro_button = ButtonElement(True, MIDI_CC_TYPE,
-                                           consts.CHANNEL, consts.OP1_MICRO)
-        self._com_button = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_COM)
-
-        # encoder for transport control - leave it empty for now
-        self._encoder_1 = EncoderElement(MIDI_CC_TYPE, consts.CHANNEL,
-                                         consts.OP1_ENCODER_1,
-                                         Live.MidiMap.MapMode.relative_two_compliment)
-        self._encoder_2 = EncoderElement(MIDI_CC_TYPE, consts.CHANNEL,
-                                         consts.OP1_ENCODER_2,
-                                         Live.MidiMap.MapMode.relative_two_compliment)
-        self._encoder_3 = EncoderElement(MIDI_CC_TYPE, consts.CHANNEL,
-                                         consts.OP1_ENCODER_3,
-                                         Live.MidiMap.MapMode.relative_two_compliment)
-        self._encoder_4 = EncoderElement(MIDI_CC_TYPE, consts.CHANNEL,
-                                         consts.OP1_ENCODER_4,
-                                         Live.MidiMap.MapMode.relative_two_compliment)
-# setting misc listeners
-
-        self._encoder_1_push = ButtonElement(True, MIDI_CC_TYPE,
-                                             consts.CHANNEL, consts.OP1_ENCODER_1_PUSH)
-        self._encoder_2_push = ButtonElement(True, MIDI_CC_TYPE,
-                                             consts.CHANNEL, consts.OP1_ENCODER_2_PUSH)
-        self._encoder_3_push = ButtonElement(True, MIDI_CC_TYPE,
-                                             consts.CHANNEL, consts.OP1_ENCODER_3_PUSH)
-        self._encoder_4_push = ButtonElement(True, MIDI_CC_TYPE,
-                                             consts.CHANNEL, consts.OP1_ENCODER_4_PUSH)
-
-
-        self.mainview_toggle_button = ButtonElement(False, MIDI_CC_TYPE,
-                                                    consts.CHANNEL,
-                                                    consts.OP1_ARROW_DOWN_BUTTON)
-
-        self.detailview_toggle_button = ButtonElement(False, MIDI_CC_TYPE,
-                                                      consts.CHANNEL,
-                                                      consts.OP1_SCISSOR_BUTTON)
-
-        self.clear_track_button = ButtonElement(True, MIDI_CC_TYPE,
-                                                consts.CHANNEL, consts.OP1_SS8_BUTTON)
-
-        self.back_to_arranger_button = ButtonElement(True, MIDI_CC_TYPE,
-                                                     consts.CHANNEL, consts.OP1_SEQ_BUTTON)
- 
+        # strip owning the OP-1 strip controls, and the control bound to each setter
+        self._channel_strip = None
+        self._strip_bindings = dict(STRIP_SETTERS)
+        self._send_encoders = None
 
 
 
@@ -151,6 +152,11 @@ class OP1ModeSelectorComponent(ModeSelectorComponent):
         self.update()
 
     def disconnect(self):
+        self._shift_button.remove_value_listener(self.shift_pressed)
+        for button in self._layered_buttons:
+            button.remove_value_listener(self.layered_button_pressed)
+
+        self._track_index.disconnect()
         ModeSelectorComponent.disconnect(self)
         self._transport = None
         return None
@@ -158,6 +164,10 @@ class OP1ModeSelectorComponent(ModeSelectorComponent):
     def number_of_modes(self):
         return consts.NUM_MODES
 
+    def _register_layers(self, mode, identifier, handler, shifted_handler):
+        self._buttons_dispatch.register(mode, identifier, handler)
+        self._buttons_dispatch.register(mode, identifier, shifted_handler, layer=LAYER_SHIFT)
+
     def left_arrow_pressed(self, value):
         if (value == 127):
             self._parent.song().scrub_by(-1)
@@ -167,35 +177,33 @@ class OP1ModeSelectorComponent(ModeSelectorComponent):
             self._parent.song().scrub_by(1)
 
     def shift_pressed(self, value):
-        # handling shift pressed (only for transport mode)
-        if (self._current_mode == consts.OP1_MODE_TRANSPORT):
-            if (value == 127):
-                # self._transport.set_seek_buttons(None, None)
-                self._left_arrow_button.add_value_listener(self.shifted_left_arrow_pressed)
-                self._right_arrow_button.add_value_listener(self.shifted_right_arrow_pressed)
-                self._left_arrow_button.remove_value_listener(self.left_arrow_pressed)
-                self._right_arrow_button.remove_value_listener(self.right_arrow_pressed)
-            else:
-                self._left_arrow_button.add_value_listener(self.left_arrow_pressed)
-                self._right_arrow_button.add_value_listener(self.right_arrow_pressed)
-                self._left_arrow_button.remove_value_listener(self.shifted_left_arrow_pressed)
-                self._right_arrow_button.remove_value_listener(self.shifted_right_arrow_pressed)
-        # globals - browser toggle with shift only
+        # swapping to the shift layer while shift is held
         if value == 127:
             self._parent.shift_pressed = True
-            self.lift_button.remove_value_listener(self.lift_button_callback)
-            self._parent._transport.set_punch_buttons(None, None)
-            self.ss1_button.add_value_listener(self.ss1_loop_start_callback)
-            self.ss2_button.add_value_listener(self.ss2_loop_end_callback)
-            self.lift_button.add_value_listener(self.lift_button_shifted_callback)
+            self._buttons_dispatch.push_layer(LAYER_SHIFT)
         else:
-            self.lift_button.remove_value_listener(self.lift_button_shifted_callback)
-            self.ss1_button.remove_value_listener(self.ss1_loop_start_callback)
-            self.ss2_button.remove_value_listener(self.ss2_loop_end_callback)
-            self.lift_button.add_value_listener(self.lift_button_callback)
-            self._parent._transport.set_punch_buttons(self.ss1_button, self.ss2_button)
+            # like the listener of the baseline, lift sets or deletes cues
+            # from the first shift release on
+            if not self._lift_cue_enabled:
+                self._lift_cue_enabled = True
+                for mode in range(consts.NUM_MODES):
+                    self._buttons_dispatch.register(mode, consts.OP1_ARROW_UP_BUTTON,
+                                                    self.lift_button_callback)
+            self._buttons_dispatch.pop_layer(LAYER_SHIFT)
             self._parent.shift_pressed = False
 
+    def layered_button_pressed(self, value, sender):
+        # resolving handler for current mode and modifier layer
+        self._buttons_dispatch.dispatch(value, sender)
+
+    def ss1_punch_in_callback(self, value):
+        if (value == 127):
+            self._parent.song().punch_in = not self._parent.song().punch_in
+
+    def ss2_punch_out_callback(self, value):
+        if (value == 127):
+            self._parent.song().punch_out = not self._parent.song().punch_out
+
     def ss1_loop_start_callback(self, value):
         self._parent.song().loop_start = round(self._parent.song().current_song_time)
 
@@ -203,19 +211,14 @@ class OP1ModeSelectorComponent(ModeSelectorComponent):
         self._parent.song().loop_end = round(self._parent.song().current_song_time)
 
     def lift_button_callback(self, value):
-        if (value == 127):
+        if (value == 127) and not self._parent.shift_pressed:
             self._parent.song().set_or_delete_cue()
 
     def lift_button_shifted_callback(self, value):
         if (value == 127):
-            if (self._parent.app.view.is_view_visible("Session")):
-                if (self._parent.app.view.is_view_visible("Browser")):
-                    self._parent.app.view.hide_view("Browser")
-                else:
-                    self._parent.app.view.show_view("Browser")
-
-            if (self._parent.app.view.is_view_visible("Arranger")):
-                if (self._parent.app.view.is_view_visible("Browser")):
+            view_state = self._parent.view_state
+            if (view_state.is_visible("Session") or view_state.is_visible("Arranger")):
+                if (view_state.is_visible("Browser")):
                     self._parent.app.view.hide_view("Browser")
                 else:
                     self._parent.app.view.show_view("Browser")
@@ -239,35 +242,23 @@ class OP1ModeSelectorComponent(ModeSelectorComponent):
         self._parent.song().loop_length = 2**index
 
     def note_key_pressed(self, value, sender):
-        # determining index of note key button in list
-        index = self.note_keys_buttons.index(sender)
-
-        if (self._current_mode == consts.OP1_MODE_MIXER):
-            # if on mixer mode, use not key to select a track
-            all_tracks = []
-
-            all_tracks.append(list(self.song().tracks))
-            all_tracks.append(list(self.song().return_tracks))
-
-            m = [self.song().master_track]
-            all_tracks.append(m)
-
-            all_tracks = [item for sublist in all_tracks for item in sublist]
+        # resolving handler and key index for current mode
+        self._note_keys_dispatch.dispatch(value, sender)
 
-            if (index < len(all_tracks)):
-                self.song().view.selected_track = all_tracks[index]
+    def select_track_key_pressed(self, value, index):
+        # if on mixer mode, use note key to select a track
+        track = self._track_index.track(index)
 
-        elif (self._current_mode == consts.OP1_MODE_TRANSPORT):
-            # if on transport mode, use key to set loop
-            self.set_loop(index, False)
+        if (track is not None):
+            self.song().view.selected_track = track
 
-    def note_key_shifted_pressed(self, value, sender):
-        # determining index of note key button in list
-        index = self.note_keys_shifted_buttons.index(sender)
+    def loop_key_pressed(self, value, index):
+        # if on transport mode, use key to set loop
+        self.set_loop(index, False)
 
-        if (self._current_mode == consts.OP1_MODE_TRANSPORT):
-            # if on transport mode, use key to set loop with loop start change
-            self.set_loop(index, True)
+    def loop_start_key_pressed(self, value, index):
+        # if on transport mode, use shifted key to set loop with loop start change
+        self.set_loop(index, True)
 
     def clip_color_changed(self):
         self._parent.log("clip color changed")
@@ -279,199 +270,138 @@ class OP1ModeSelectorComponent(ModeSelectorComponent):
         # handle current mode change
         if not self.is_enabled():
             return
-        # clearing last mappings
-        self.clear()
 
-        self._session.set_scene_bank_buttons(self._com_button, self._micro_button)
+        # moving from last mode mappings to the ones of the new mode
+        mapping = self._mappings.get(self._mode_index)
+        if mapping is None:
+            mapping = self._build_mode(self._mode_index)
+        self._apply_mapping(mapping)
 
         # updating current mode index
         self._current_mode = self._mode_index
-
-        # based on current mode, perform necessay re mappings
-        if (self._mode_index == consts.OP1_MODE_PERFORM):
-            # nothing is done for perform mode
-            self._parent.log("PERFORM MODE")
-
-            self._channel_strip = self._mixer.selected_strip()
-            # perform track assignments
-            self._channel_strip.set_volume_control(self._encoder_1)
-            self._channel_strip.set_pan_control(self._encoder_2)
-
-            # setting solo button
-            self._channel_strip.set_solo_button(self._ss6_button)
-
-            # if track can be armed, set arm button
-            if (self._channel_strip._track.can_be_armed):
-                b = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS7_BUTTON)
-                self._channel_strip.set_arm_button(b)
-            # if track is no master, set mute button
-            if (self._channel_strip._track != self.song().master_track):
-                b = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS5_BUTTON)
-                self._channel_strip.set_mute_button(b)
-
-            # setting a tuple of encoders to control sends
-            send_controls = self._encoder_3, self._encoder_4,
-            # setting send encoders
-            self._channel_strip.set_send_controls(tuple(send_controls))
-
-
-
-
-
-
-
-
-        elif (self._mode_index == consts.OP1_MODE_TRANSPORT):
-            self._parent.log("TRANSPORT MODE")
-
-            self._left_arrow_button.add_value_listener(self.left_arrow_pressed)
-            self._right_arrow_button.add_value_listener(self.right_arrow_pressed)
-
-            # settings arrows as seek buttons - doesn't work - can't understand why
-            # self._transport.set_seek_buttons(self._right_arrow_button, self._left_arrow_button)
-
-            # adding value listeners for note keys and note shifted keys
-
-            for i in range(consts.NUM_TRACKS):
-                self.note_keys_buttons[i].add_value_listener(self.note_key_pressed, True)
-
-            for i in range(consts.NUM_TRACKS):
-                self.note_keys_shifted_buttons[i].add_value_listener(
-                    self.note_key_shifted_pressed, True)
-
-
-            self._parent.clear_tracks_assigments()
-            self._session.set_scene_bank_buttons(None, None)
-            self._encoder_1.add_value_listener(self._parent.e1_transport_scrub)
-            self._encoder_2.add_value_listener(self._parent.e2_transport_scrub)
-            self._encoder_3.add_value_listener(self._parent.e3_transport_scroll)
-            self._encoder_4.add_value_listener(self._parent.e4_transport_zoom)
-            self._micro_button.add_value_listener(self._parent.mic_button_sel_up)
-            self._com_button.add_value_listener(self._parent.com_button_sel_down)
-            # setting solo button
-            self._channel_strip.set_solo_button(self._ss6_button)
-            # if track can be armed, set arm button
-            if (self._channel_strip._track.can_be_armed):
-                b = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS7_BUTTON)
-                self._channel_strip.set_arm_button(b)
-            # if track is no master, set mute button
-            if (self._channel_strip._track != self.song().master_track):
-                b = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS5_BUTTON)
-                self._channel_strip.set_mute_button(b)
-
-        elif (self._mode_index == consts.OP1_MODE_MIXER):
-            self._parent.log("MIXER MODE")
-
-            # setting arrow butons as track select buttons
-            self._mixer.set_select_buttons(self._right_arrow_button, self._left_arrow_button)
-
-            # adding value listeners for note keys
-            for i in range(consts.NUM_TRACKS):
-                self.note_keys_buttons[i].add_value_listener(self.note_key_pressed, True)
-
-        elif (self._mode_index == consts.OP1_MODE_CLIP):
-            self._parent.log("CLIP MODE")
-
-            # setting arrows as track bank buttons - not working - can't understand why
-            self._session.set_track_bank_buttons(self._right_arrow_button, self._left_arrow_button)
-
-            # setting last key note as stop all clip button
-            self._session.set_stop_all_clips_button(ButtonElement(True, MIDI_NOTE_TYPE,
-                                                                  consts.CHANNEL, 100))
-
-            # setting track stop clip buttons
-            self._session.set_stop_track_clip_buttons(tuple(self.note_keys_shifted_buttons))
-
-            # setting track individual clip launch button
-            for i in range(consts.NUM_TRACKS):
-                self._session.scene(0).clip_slot(i).set_launch_button(self.note_keys_buttons[i])
-
-            # setting scene launch button
-            self._session.scene(0).set_launch_button(self.note_keys_buttons[consts.NUM_TRACKS])
-
-
-
-            # perform track assignments
-            self._channel_strip.set_volume_control(self._encoder_1)
-            self._channel_strip.set_pan_control(self._encoder_2)
-            # setting solo button
-            self._channel_strip.set_solo_button(self._ss6_button)
-            # setting a tuple of encoders to control sends
-            send_controls = self._encoder_3, self._encoder_4,
-            # setting send encoders
-            self._channel_strip.set_send_controls(tuple(send_controls))
-            # if track can be armed, set arm button
-            if (self._channel_strip._track.can_be_armed):
-                b = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS7_BUTTON)
-                self._channel_strip.set_arm_button(b)
-            # if track is no master, set mute button
-            if (self._channel_strip._track != self.song().master_track):
-                b = ButtonElement(True, MIDI_CC_TYPE, consts.CHANNEL, consts.OP1_SS5_BUTTON)
-                self._channel_strip.set_mute_button(b)
-
+        self._note_keys_dispatch.activate(self._current_mode)
+        self._buttons_dispatch.activate(self._current_mode)
+
+    def _build_mode(self, mode):
+        # resolving mode mapping, allocating the controls it uses for the first time
+        allocations = self._parent._control_pool.allocations
+        mapping = compile_mapping(MODE_MAPPINGS[mode], self._resolve_control,
+                                  self._resolve_target, self._resolve_handler)
+        self._mappings[mode] = mapping
+
+        self._parent.log("%s MODE BUILT (%d controls allocated)" %
+                         (mapping.name, self._parent._control_pool.allocations - allocations))
+        return mapping
+
+    def _control(self, name):
+        # allocating mode controls from the pool the first time they are used
+        control = self._mode_controls.get(name)
+        if control is None:
+            (method, identifier, args) = MODE_CONTROLS[name]
+            control = getattr(self._parent._control_pool, method)(identifier, *args)
+            self._mode_controls[name] = control
+        return control
 
     def clear(self):
-
-        # remove transport assignments
-        self._encoder_1.remove_value_listener(self._parent.e1_transport_scrub)
-        self._encoder_2.remove_value_listener(self._parent.e2_transport_scrub)
-        self._encoder_3.remove_value_listener(self._parent.e3_transport_scroll)
-        self._encoder_4.remove_value_listener(self._parent.e4_transport_zoom)
-        self._micro_button.remove_value_listener(self._parent.mic_button_sel_up)
-        self._com_button.remove_value_listener(self._parent.com_button_sel_down)
-
-
-
-
-        if (self._current_mode == consts.OP1_MODE_PERFORM):
-            self._parent.log("CLEARING PERFORM MODE")
-
-        elif (self._current_mode == consts. OP1_MODE_TRANSPORT):
-            self._parent.log("CLEARING TRANSPORT MODE")
-
-            self._left_arrow_button.remove_value_listener(self.left_arrow_pressed)
-            self._right_arrow_button.remove_value_listener(self.right_arrow_pressed)
-
-            # removing value listeners for note keys
-            for i in range(consts.NUM_TRACKS):
-                self.note_keys_buttons[i].remove_value_listener(self.note_key_pressed)
-
-            # removing value listeners for shifted note keys
-            for i in range(consts.NUM_TRACKS):
-                self.note_keys_shifted_buttons[i].remove_value_listener(
-                    self.note_key_shifted_pressed)
-
-            # clearing transport seek buttons
-            self._transport.set_seek_buttons(None, None)
-
-
-        elif (self._current_mode == consts.OP1_MODE_MIXER):
-            self._parent.log("CLEARING MIXER MODE")
-
-            # removing value listeners for note key press
-            for i in range(consts.NUM_TRACKS):
-                self.note_keys_buttons[i].remove_value_listener(self.note_key_pressed)
-
-            self._parent.clear_tracks_assigments()
-
-            # clearing mixer track select buttons
-            self._mixer.set_select_buttons(None, None)
-
-        elif (self._current_mode == consts.OP1_MODE_CLIP):
-            self._parent.log("CLEARING CLIP MODE")
-
-            # clearing session track bank buttons
-            self._session.set_track_bank_buttons(None, None)
-
-            # clearing session stop all clips button
-            self._session.set_stop_all_clips_button(None)
-
-            # clearing session track stop clip buttons
-            self._session.set_stop_track_clip_buttons(None)
-
-            # clearing individual clip launch button
-            for i in range(consts.NUM_TRACKS):
-                self._session.scene(0).clip_slot(i).set_launch_button(None)
-
-            # clearing session launch button
-            self._session.scene(0).set_launch_button(None)
+        # releasing every mapping of the current mode
+        self._apply_mapping(self._empty_mapping)
+
+    def _apply_mapping(self, mapping):
+        start = timeit.default_timer()
+
+        old_mapping = self._mapping
+        self._mapping = mapping
+
+        # only calling setters and listeners that actually change
+        changes = apply_mapping_diff(old_mapping, mapping)
+
+        if (old_mapping.strip != mapping.strip):
+            changes += self.bind_channel_strip()
+
+        self._parent.log("%s MODE (%d bindings changed in %.2f ms)" %
+                         (mapping.name, changes, (timeit.default_timer() - start) * 1000.0))
+
+    def bind_channel_strip(self):
+        # moving only the strip bindings that differ for the selected track
+        strip = self._mixer.selected_strip()
+        if (strip is not self._channel_strip):
+            self.unbind_channel_strip()
+            self._channel_strip = strip
+
+        bindings = self._channel_strip_bindings(strip, self._mapping.strip)
+
+        changes = 0
+        for (setter, released) in STRIP_SETTERS:
+            control = bindings.get(setter, released)
+            if (self._strip_bindings[setter] is not control):
+                self._strip_bindings[setter] = control
+                getattr(strip, setter)(control)
+                changes += 1
+
+        return changes
+
+    def unbind_channel_strip(self):
+        # releasing the controls bound to the previous strip
+        strip = self._channel_strip
+        for (setter, released) in STRIP_SETTERS:
+            if (self._strip_bindings[setter] is not released):
+                self._strip_bindings[setter] = released
+                getattr(strip, setter)(released)
+        self._channel_strip = None
+
+    def _channel_strip_bindings(self, strip, profile):
+        # controls of the strip profile for the track of the strip
+        if (profile == STRIP_NONE):
+            return {}
+
+        track = strip._track
+
+        # setting solo button
+        bindings = {'set_solo_button': self._control('_ss6_button')}
+
+        # if track can be armed, set arm button
+        if (track.can_be_armed):
+            bindings['set_arm_button'] = self._control('_ss7_button')
+
+        # if track is no master, set mute button
+        if (track != self.song().master_track):
+            bindings['set_mute_button'] = self._control('_ss5_button')
+
+        # transport mode leaves encoders to the transport
+        if (profile == STRIP_FULL):
+            if (self._send_encoders is None):
+                self._send_encoders = (self._control('_encoder_3'), self._control('_encoder_4'))
+
+            bindings['set_volume_control'] = self._control('_encoder_1')
+            bindings['set_pan_control'] = self._control('_encoder_2')
+            bindings['set_send_controls'] = self._send_encoders
+
+        return bindings
+
+    def _resolve_control(self, ref):
+        # control attribute name, (list name, index) or (list name, ALL)
+        if isinstance(ref, str):
+            return self._control(ref)
+
+        name, index = ref
+        if (index is ALL):
+            return tuple(self._control(name))
+        return self._control(name)[index]
+
+    def _resolve_target(self, ref):
+        if (ref == 'session'):
+            return self._session
+        elif (ref == 'mixer'):
+            return self._mixer
+        elif (ref == 'transport'):
+            return self._transport
+        elif (ref == 'scene'):
+            return self._session.scene(0)
+
+        # ('clip_slot', index) of first session scene
+        return self._session.scene(0).clip_slot(ref[1])
+
+    def _resolve_handler(self, ref):
+        if ref.startswith('parent.'):
+            return getattr(self._parent, ref[len('parent.'):])
+        return getattr(self, ref)
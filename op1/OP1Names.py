@@ -0,0 +1,144 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+import unicodedata
+from collections import OrderedDict
+
+import consts
+
+from OP1LiveUtils import liveobj_valid
+
+# to properly display strings on op1 display we need to do some character substitution
+REPL_CHARS = " " * 32
+REPL_CHARS += """ !\"# %    *+,-./0123456789:;<=> @abcdefghijklmnopqrstuvwxyz    _ abcdefghijklmnopqrstuvwxyz -  """   # noqa: E501
+REPL_CHARS += " " * 129
+
+PRINTABLE_TABLE = bytes(bytearray(REPL_CHARS.encode('ascii')))
+
+# letters that do not decompose into an ascii letter plus accents
+SPECIAL_FOLDS = {
+    0x00df: u'ss',  # sharp s
+    0x00e6: u'ae', 0x00c6: u'ae',
+    0x0153: u'oe', 0x0152: u'oe',
+    0x00f8: u'o', 0x00d8: u'o',
+    0x0142: u'l', 0x0141: u'l',
+    0x0111: u'd', 0x0110: u'd',
+    0x00f0: u'd', 0x00d0: u'd',
+    0x00fe: u'th', 0x00de: u'th',
+    0x0131: u'i',
+    0x2018: u"'", 0x2019: u"'",
+    0x2013: u'-', 0x2014: u'-',
+}
+
+# there is 20 character display limit for the bottom line
+MAX_NAME_LENGTH = 20
+
+
+def fold_to_ascii(txt):
+    """transliterate text to ascii, dropping accents (e -> e, u -> u)
+    and spelling out ligatures. Characters without ascii equivalent
+    become '?', which is then printed as a space."""
+    if isinstance(txt, bytes):
+        txt = txt.decode('utf-8', 'replace')
+    elif not isinstance(txt, type(u'')):
+        txt = u'%s' % (txt,)
+
+    txt = unicodedata.normalize('NFKD', txt.translate(SPECIAL_FOLDS))
+    txt = u''.join(c for c in txt if not unicodedata.combining(c))
+    return txt.encode('ascii', 'replace')
+
+
+def to_op1_printable(txt):
+    """convert a string into OP1 printable character.
+    This will change non-printable chars, that would
+    be otherwise displayed as '?', into spaces."""
+    tr = fold_to_ascii(txt).translate(PRINTABLE_TABLE)  # replace non-printable chars with spaces
+    tr = b' '.join(tr.split())            # replace multiple white space chars with a single space
+    tr = tr[:MAX_NAME_LENGTH]
+
+    # returning native str
+    return tr if isinstance(tr, str) else tr.decode('ascii')
+
+
+class OP1NameFormatter(object):
+    """Bounded LRU cache of to_op1_printable, keyed by the raw name."""
+
+    def __init__(self, maxsize=consts.NAME_CACHE_SIZE):
+        self._maxsize = maxsize
+        self._names = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def format(self, name):
+        printable = self._names.pop(name, None)
+
+        if printable is None:
+            self.misses += 1
+            printable = to_op1_printable(name)
+
+            # dropping least recently used name
+            if len(self._names) >= self._maxsize:
+                self._names.popitem(last=False)
+        else:
+            self.hits += 1
+
+        # (re)inserting as most recently used
+        self._names[name] = printable
+        return printable
+
+    def evict(self, name):
+        self._names.pop(name, None)
+
+    def __len__(self):
+        return len(self._names)
+
+
+class OP1NameObserver(object):
+    """Keeps a name listener on one track or scene at a time. On rename, the
+    old name is evicted from the formatter and name_changed is called."""
+
+    def __init__(self, formatter, name_changed):
+        self._formatter = formatter
+        self._name_changed = name_changed
+        self._subject = None
+        self._name = None
+
+    def observe(self, subject):
+        if subject == self._subject:
+            return
+
+        self.disconnect()
+        if liveobj_valid(subject):
+            self._subject = subject
+            self._name = subject.name
+            subject.add_name_listener(self._on_name_changed)
+
+    def disconnect(self):
+        subject = self._subject
+        self._subject = None
+        self._name = None
+
+        if liveobj_valid(subject) and subject.name_has_listener(self._on_name_changed):
+            subject.remove_name_listener(self._on_name_changed)
+
+    def _on_name_changed(self):
+        self._formatter.evict(self._name)
+        self._name = self._subject.name
+        self._name_changed()
@@ -0,0 +1,96 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+import bisect
+import timeit
+
+# Upper bounds of the histogram buckets, in microseconds. Calls slower than
+# the last bound are counted in an extra overflow bucket
+
+BUCKET_BOUNDS_US = (100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+
+
+class OP1Histogram(object):
+    """Call count and fixed bucket latency histogram of one handler."""
+
+    __slots__ = ('counts', 'calls', 'total_us', 'max_us')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_US) + 1)
+        self.calls = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def add(self, seconds):
+        us = seconds * 1000000
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_US, us)] += 1
+        self.calls += 1
+        self.total_us += us
+        if us > self.max_us:
+            self.max_us = us
+
+    def summary(self):
+        mean_us = self.total_us / self.calls if self.calls else 0.0
+        buckets = ' '.join("%d" % count for count in self.counts)
+        return "%d calls, mean %.0f us, max %.0f us, buckets %s" % (
+            self.calls, mean_us, self.max_us, buckets)
+
+
+class OP1Profiler(object):
+    """Times handlers by replacing them on their instance with a wrapper.
+
+    Handlers must be instrumented before they are registered as listeners,
+    so that the wrapper is what gets registered. Nothing is wrapped unless
+    instrument is called, so a surface without profiler pays no overhead."""
+
+    def __init__(self, timer=timeit.default_timer):
+        self._timer = timer
+        self._histograms = []
+
+    def instrument(self, owner, name, label=None):
+        method = getattr(owner, name)
+        histogram = OP1Histogram()
+        self._histograms.append((label or name, histogram))
+
+        timer = self._timer
+
+        def timed(*a, **k):
+            start = timer()
+            try:
+                return method(*a, **k)
+            finally:
+                histogram.add(timer() - start)
+
+        setattr(owner, name, timed)
+        return histogram
+
+    def reset(self):
+        for (_, histogram) in self._histograms:
+            histogram.reset()
+
+    def report(self):
+        """One line per handler, slowest total time first."""
+        lines = ["buckets (us): <=" + " <=".join(str(b) for b in BUCKET_BOUNDS_US) + " >"]
+        histograms = sorted(self._histograms, key=lambda h: h[1].total_us, reverse=True)
+        for (label, histogram) in histograms:
+            lines.append("%s: %s" % (label, histogram.summary()))
+        return lines
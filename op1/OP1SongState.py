@@ -0,0 +1,109 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+
+class OP1SongStateCache(object):
+    """Formatted transport mode text, kept up to date by song listeners.
+
+    Play and record state, quantization and tempo fragments are only
+    formatted again when Live reports a change. refresh() is called every
+    display tick and only reads the song position, rebuilding its string
+    when the displayed bar.beat.sixteenth changes."""
+
+    def __init__(self, song, quant_str):
+        self._song = song
+
+        # callback formatting a clip trigger quantization value
+        self._quant_str = quant_str
+
+        self._status = None
+        self._quant = None
+        self._tempo = None
+        self._header = None
+
+        self._position_key = None
+        self._position = ''
+
+        self._text = None
+        self._changed = True
+
+        self._song.add_is_playing_listener(self._on_status_changed)
+        self._song.add_record_mode_listener(self._on_status_changed)
+        self._song.add_clip_trigger_quantization_listener(self._on_quantization_changed)
+        self._song.add_tempo_listener(self._on_tempo_changed)
+
+        self._on_status_changed()
+        self._on_quantization_changed()
+        self._on_tempo_changed()
+
+    def disconnect(self):
+        self._song.remove_is_playing_listener(self._on_status_changed)
+        self._song.remove_record_mode_listener(self._on_status_changed)
+        self._song.remove_clip_trigger_quantization_listener(self._on_quantization_changed)
+        self._song.remove_tempo_listener(self._on_tempo_changed)
+
+    def _on_status_changed(self):
+        playing = '>' if self._song.is_playing else ''
+        record = '*' if self._song.record_mode else ''
+        self._set_fragments(status=playing + record)
+
+    def _on_quantization_changed(self):
+        self._set_fragments(quant=self._quant_str(self._song.clip_trigger_quantization))
+
+    def _on_tempo_changed(self):
+        self._set_fragments(tempo="%.2f" % round(self._song.tempo, 2))
+
+    def _set_fragments(self, status=None, quant=None, tempo=None):
+        if status is not None:
+            self._status = status
+        if quant is not None:
+            self._quant = quant
+        if tempo is not None:
+            self._tempo = tempo
+
+        header = "%s %s %s" % (self._status, self._quant, self._tempo)
+        if header != self._header:
+            self._header = header
+            self._text = None
+
+    def refresh(self):
+        """Reads the song position, returns True when the text changed
+        since the last refresh."""
+        beat_time = self._song.get_current_beats_song_time()
+        key = (beat_time.bars, beat_time.beats, beat_time.sub_division)
+
+        # rebuilding position string only when the displayed value changes
+        if key != self._position_key:
+            self._position_key = key
+            song_time = str(beat_time)
+            self._position = song_time[:len(song_time) - 4]
+            self._text = None
+
+        if self._text is None:
+            self._text = self._header + "\r" + self._position
+            self._changed = True
+
+        changed = self._changed
+        self._changed = False
+        return changed
+
+    def transport_text(self):
+        if self._text is None:
+            self.refresh()
+        return self._text
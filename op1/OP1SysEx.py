@@ -0,0 +1,84 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+# Fixed OP-1 sysex messages
+
+ENABLE_FRAME = (0xf0, 0x00, 0x20, 0x76, 0x00, 0x01, 0x02, 0xf7)
+DISABLE_FRAME = (0xf0, 0x00, 0x20, 0x76, 0x00, 0x01, 0x00, 0xf7)
+IDENTITY_REQUEST_FRAME = (0xf0, 0x7e, 0x7f, 0x06, 0x01, 0xf7)
+
+# Headers of the messages carrying a payload
+
+TEXT_HEADER = (0xf0, 0x00, 0x20, 0x76, 0x00, 0x03)
+COLORS_HEADER = (0xf0, 0x00, 0x20, 0x76, 0x00, 0x04)
+SYSEX_END = 0xf7
+
+# end of the clip color message, as a tuple to concatenate
+COLORS_END = (SYSEX_END,)
+
+# payload starts after the header and its length byte
+PAYLOAD_OFFSET = len(TEXT_HEADER) + 1
+
+# longest payload whose length still fits in a 7 bit byte
+MAX_PAYLOAD_LENGTH = 0x7f
+
+# bytes allowed in a sysex payload, deleting them leaves only the invalid ones
+SEVEN_BIT_BYTES = bytes(bytearray(range(0x80)))
+
+# maps every byte to itself, bytes with the high bit set become '?'
+SEVEN_BIT_TABLE = bytes(bytearray(range(0x80)) + bytearray(b'?' * 0x80))
+
+
+class OP1SysExEncoder(object):
+    """Encodes text messages into preallocated bytearray frames, one frame
+    per payload length, patching only the payload bytes. Payloads are
+    checked to be 7 bit safe, and a tuple is only created at the boundary
+    with Live's send_midi.
+
+    Clip color frames stay plain tuple concatenations: their payload is
+    already 7 bit and copying it into a bytearray frame was slower."""
+
+    def __init__(self):
+        # payload length -> text frame
+        self._text_frames = {}
+
+    def text(self, text):
+        if not isinstance(text, bytes):
+            text = text.encode('latin-1', 'replace')
+
+        length = min(len(text), MAX_PAYLOAD_LENGTH)
+        frame = self._text_frames.get(length)
+        if frame is None:
+            # header, length, payload and end byte
+            frame = bytearray(TEXT_HEADER) + bytearray(length + 2)
+            frame[PAYLOAD_OFFSET - 1] = length
+            frame[-1] = SYSEX_END
+            self._text_frames[length] = frame
+
+        # replacing bytes that would break the sysex message
+        payload = text[:length]
+        if payload.translate(None, SEVEN_BIT_BYTES):
+            payload = payload.translate(SEVEN_BIT_TABLE)
+
+        frame[PAYLOAD_OFFSET:len(frame) - 1] = payload
+        return tuple(frame)
+
+    def colors(self, count, colors):
+        # colors holds 3 bytes (r, g, b) per column, each already 7 bit
+        return COLORS_HEADER + (count,) + tuple(colors[:3 * count]) + COLORS_END
@@ -0,0 +1,149 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+import struct
+import time
+import timeit
+
+import consts
+
+# Trace file layout: magic and version, followed by records of
+# (microseconds since previous record, kind, payload length) and the payload
+
+TRACE_MAGIC = b'OP1T'
+TRACE_VERSION = 1
+
+FILE_HEADER = struct.Struct('<4sB')
+RECORD_HEADER = struct.Struct('<IBH')
+
+# longest delay a record can hold, ~71 minutes
+MAX_DELTA_US = 0xffffffff
+
+# Record kinds
+
+RECORD_IN = 0       # midi received from the OP-1
+RECORD_OUT = 1      # midi sent to the OP-1
+RECORD_TICK = 2     # update_display call, no payload
+
+RECORD_KINDS = ('in', 'out', 'tick')
+
+
+class OP1TraceRecorder(object):
+    """Writes timestamped inbound and outbound midi, and display ticks, to a
+    binary trace file. Writes are buffered by the file object and flushed
+    every flush_records records, or on a display tick with no midi since
+    the previous one, so a crash loses at most one burst of records while
+    recording stays cheap on Live's UI thread."""
+
+    def __init__(self, path, flush_records=consts.MIDI_TRACE_FLUSH_RECORDS):
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(FILE_HEADER.pack(TRACE_MAGIC, TRACE_VERSION))
+        self._last = timeit.default_timer()
+        self._last_kind = None
+
+        self._flush_records = flush_records
+        self._unflushed = 0
+
+        self.records = 0
+
+    def record(self, kind, midi_bytes=()):
+        now = timeit.default_timer()
+        delta = min(int((now - self._last) * 1000000), MAX_DELTA_US)
+        self._last = now
+
+        self._file.write(RECORD_HEADER.pack(delta, kind, len(midi_bytes)))
+        if midi_bytes:
+            self._file.write(bytes(bytearray(midi_bytes)))
+        self.records += 1
+        self._unflushed += 1
+
+        # flushing full batches, and whatever is left once the surface is idle
+        idle = (kind == RECORD_TICK) and (self._last_kind == RECORD_TICK)
+        self._last_kind = kind
+        if (self._unflushed >= self._flush_records) or (idle and self._unflushed > 1):
+            self._file.flush()
+            self._unflushed = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_trace(path):
+    """Returns the records of a trace file as (delay in seconds, kind, midi
+    bytes tuple) tuples. Raises ValueError on a malformed or truncated file."""
+    with open(path, 'rb') as trace:
+        data = trace.read()
+
+    if len(data) < FILE_HEADER.size:
+        raise ValueError("not an OP-1 trace: " + path)
+    (magic, version) = FILE_HEADER.unpack_from(data, 0)
+    if (magic != TRACE_MAGIC) or (version != TRACE_VERSION):
+        raise ValueError("not an OP-1 trace, or unsupported version: " + path)
+
+    records = []
+    offset = FILE_HEADER.size
+    while offset < len(data):
+        if offset + RECORD_HEADER.size > len(data):
+            raise ValueError("truncated trace record at byte %d" % offset)
+        (delta, kind, length) = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+
+        payload = bytearray(data[offset:offset + length])
+        if (len(payload) != length) or (kind >= len(RECORD_KINDS)):
+            raise ValueError("malformed trace record at byte %d" % offset)
+        offset += length
+
+        records.append((delta / 1000000.0, kind, tuple(payload)))
+    return records
+
+
+class OP1TraceReplayer(object):
+    """Feeds the inbound midi and display ticks of a trace back into a
+    surface, either with the recorded delays or as fast as possible.
+    Outbound records are skipped, as the surface sends its own."""
+
+    def __init__(self, receive_midi, update_display, sleep=time.sleep):
+        self._receive_midi = receive_midi
+        self._update_display = update_display
+        self._sleep = sleep
+
+        self.messages = 0
+        self.ticks = 0
+
+    def replay(self, records, realtime=False):
+        # delays of skipped outbound records still count towards the next one
+        delay = 0.0
+        for (delta, kind, midi_bytes) in records:
+            delay += delta
+            if kind == RECORD_OUT:
+                continue
+
+            if realtime and (delay > 0):
+                self._sleep(delay)
+            delay = 0.0
+
+            if kind == RECORD_IN:
+                self._receive_midi(midi_bytes)
+                self.messages += 1
+            else:
+                self._update_display()
+                self.ticks += 1
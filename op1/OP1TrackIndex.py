@@ -0,0 +1,55 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+
+class OP1TrackIndex(object):
+    """Flat tuple of tracks, return tracks and master track, in the order
+    the mixer mode note keys select them.
+
+    The tuple is rebuilt lazily after the song track lists change. When
+    visible_only is set, tracks hidden inside folded groups are skipped so
+    keys map to the tracks actually shown in Live."""
+
+    def __init__(self, song, visible_only=False):
+        self._song = song
+        self._visible_only = visible_only
+        self._tracks = None
+
+        self._song.add_tracks_listener(self.invalidate)
+        self._song.add_return_tracks_listener(self.invalidate)
+        self._song.add_visible_tracks_listener(self.invalidate)
+
+    def disconnect(self):
+        self._song.remove_tracks_listener(self.invalidate)
+        self._song.remove_return_tracks_listener(self.invalidate)
+        self._song.remove_visible_tracks_listener(self.invalidate)
+
+    def invalidate(self):
+        self._tracks = None
+
+    def tracks(self):
+        if self._tracks is None:
+            song = self._song
+            tracks = song.visible_tracks if self._visible_only else song.tracks
+            self._tracks = tuple(tracks) + tuple(song.return_tracks) + (song.master_track,)
+        return self._tracks
+
+    def track(self, index):
+        tracks = self.tracks()
+        return tracks[index] if 0 <= index < len(tracks) else None
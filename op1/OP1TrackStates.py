@@ -0,0 +1,124 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+import weakref
+
+from OP1ClipListeners import OP1ListenerStore
+from OP1LiveUtils import liveobj_valid
+
+# Track states cleared by the clear track button
+STATES = ('arm', 'solo', 'mute')
+
+
+class _StateCallback(object):
+    """arm, solo or mute listener of one track."""
+
+    __slots__ = ('_index', 'track', 'state')
+
+    def __init__(self, index, track, state):
+        self._index = weakref.ref(index)
+        self.track = track
+        self.state = state
+
+    def __call__(self):
+        index = self._index()
+        if index is not None:
+            index._on_state_changed(self.track, self.state)
+
+
+class OP1TrackStateIndex(object):
+    """Tracks and return tracks that are currently armed, soloed or muted,
+    kept up to date by their listeners.
+
+    Track list changes only mark the index dirty, listeners of added and
+    deleted tracks are synced on the next reset."""
+
+    def __init__(self, song):
+        self._song = song
+        self._listeners = dict((state, OP1ListenerStore(state)) for state in STATES)
+        self._active = dict((state, set()) for state in STATES)
+        self._tracks = ()
+
+        self._dirty = True
+        self._song.add_tracks_listener(self.invalidate)
+        self._song.add_return_tracks_listener(self.invalidate)
+
+        self.sync()
+
+    def disconnect(self):
+        self._song.remove_tracks_listener(self.invalidate)
+        self._song.remove_return_tracks_listener(self.invalidate)
+
+        for store in self._listeners.values():
+            store.clear()
+        for tracks in self._active.values():
+            tracks.clear()
+        self._tracks = ()
+
+    def invalidate(self):
+        self._dirty = True
+
+    def sync(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        tracks = tuple(self._song.tracks) + tuple(self._song.return_tracks)
+
+        # releasing deleted tracks
+        current = set(tracks)
+        for track in self._tracks:
+            if track not in current:
+                for state in STATES:
+                    self._listeners[state].unsubscribe(track)
+                    self._active[state].discard(track)
+
+        # observing added tracks, starting from their current state
+        previous = set(self._tracks)
+        for track in tracks:
+            if track in previous:
+                continue
+            for state in STATES:
+                if (state == 'arm') and not track.can_be_armed:
+                    continue
+                if self._listeners[state].subscribe(track, _StateCallback(self, track, state)):
+                    self._on_state_changed(track, state)
+
+        self._tracks = tracks
+
+    def reset(self):
+        """Disarms, unsolos and unmutes every track and return track, only
+        writing to those actually set. Returns the number of writes."""
+        self.sync()
+
+        writes = 0
+        for state in STATES:
+            # listeners remove tracks from the set while it is reset
+            for track in list(self._active[state]):
+                if liveobj_valid(track):
+                    setattr(track, state, False)
+                    writes += 1
+
+        return writes
+
+    def _on_state_changed(self, track, state):
+        if getattr(track, state):
+            self._active[state].add(track)
+        else:
+            self._active[state].discard(track)
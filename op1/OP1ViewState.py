@@ -0,0 +1,55 @@
+##################################################################
+#
+#   Copyright (C) 2012 Imaginando, Lda & Teenage Engineering AB
+#
+#   This program is free software; you can redistribute it and/or
+#   modify it under the terms of the GNU General Public License
+#   as published by the Free Software Foundation; either version 2
+#   of the License, or any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   For more information about this license please consult the
+#   following webpage: http://www.gnu.org/licenses/gpl-2.0.html
+#
+##################################################################
+
+# Live views whose visibility is tracked
+VIEWS = ("Session", "Arranger", "Browser", "Detail")
+
+
+class OP1ViewState(object):
+    """Visibility of Live's main views, updated by is_view_visible listeners
+    instead of being polled on every display tick."""
+
+    def __init__(self, app_view):
+        self._view = app_view
+        self._visible = {}
+        self._callbacks = {}
+
+        for name in VIEWS:
+            callback = self._make_callback(name)
+            self._callbacks[name] = callback
+            self._view.add_is_view_visible_listener(name, callback)
+            self._visible[name] = self._view.is_view_visible(name)
+
+        self.detail_visible = self._visible["Detail"]
+
+    def disconnect(self):
+        for name, callback in self._callbacks.items():
+            if self._view.is_view_visible_has_listener(name, callback):
+                self._view.remove_is_view_visible_listener(name, callback)
+        self._callbacks = {}
+
+    def _make_callback(self, name):
+        return lambda: self._on_view_changed(name)
+
+    def _on_view_changed(self, name):
+        self._visible[name] = self._view.is_view_visible(name)
+        self.detail_visible = self._visible["Detail"]
+
+    def is_visible(self, name):
+        return self._visible[name]
@@ -84,3 +84,64 @@ OP1_SHIFT_BUTTON = 43
 
 OP1_MICRO = 48
 OP1_COM = 49
+
+# Clip listeners: only observe the clip slots shown on the OP-1 (session ring)
+# instead of every clip slot of the song
+
+CLIP_LISTENERS_SESSION_RING_ONLY = True
+
+# Mixer mode: note keys only select tracks visible in Live (skipping folded groups)
+
+MIXER_KEYS_VISIBLE_TRACKS_ONLY = False
+
+# Connection handshake timings, in display ticks (Live calls update_display every ~100ms)
+
+HANDSHAKE_RETRY_TICKS = 10
+HANDSHAKE_MAX_RETRY_TICKS = 160
+HANDSHAKE_KEEPALIVE_TICKS = 50
+HANDSHAKE_KEEPALIVE_TIMEOUT_TICKS = 20
+
+# Identity requests sent while probing before giving up until Live reports a
+# midi port change (refresh_state) or an identity reply arrives anyway
+HANDSHAKE_MAX_RETRIES = 8
+
+# Transport encoders: OP-1 sends relative two's complement values of +/-4 per detent.
+# Steps of one tick above the threshold are multiplied by the acceleration factor
+
+ENCODER_STEP_SIZE = 4
+ENCODER_ACCEL_THRESHOLD = 2
+ENCODER_ACCEL_FACTOR = 2
+
+# scroll_view and zoom_view have no step count, one call per step is the limit of
+# the api, calls per tick are capped
+ENCODER_MAX_VIEW_STEPS = 16
+
+# Number of track and scene names kept formatted for the OP-1 display
+
+NAME_CACHE_SIZE = 64
+
+# MIDI trace: set to a file path (e.g. "~/op1-midi.trace") to record the midi exchanged
+# with the OP-1 and display ticks, for replaying with sim/replay_trace.py
+
+MIDI_TRACE_PATH = None
+
+# Trace records written before the file is flushed, a display tick without
+# midi since the previous one flushes as well
+
+MIDI_TRACE_FLUSH_RECORDS = 256
+
+# Callback profiling: time the main surface callbacks into latency histograms,
+# logged and cleared when pressing shift + encoder 1, and logged on disconnect.
+# Callbacks are not wrapped when disabled
+
+PROFILE_CALLBACKS = False
+
+# Outbound midi: bytes sent to the OP-1 per display tick, messages over budget are
+# queued by priority (handshake, text, clip colors) for the next ticks
+
+MIDI_OUT_BYTES_PER_TICK = 128
+
+# Track selection: display ticks the selected track must stay unchanged before the
+# strip controls are rebound to it (0 rebinds on every selection change)
+
+TRACK_SELECT_SETTLE_TICKS = 2
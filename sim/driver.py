@@ -0,0 +1,178 @@
+"""Headless driver for the OP-1 surface.
+
+Puts the stand-in `Live` and `_Framework` modules on sys.path, builds a
+song, instantiates the surface through `create_instance` and lets callers
+inject MIDI and tick `update_display` like Live does every 100ms."""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+sys.path.insert(0, os.path.join(HERE, 'live_stub'))
+sys.path.insert(0, ROOT)
+
+import Live  # noqa: E402
+from Live.Base import API_CALLS  # noqa: E402
+
+IDENTITY_REQUEST = (0xf0, 0x7e, 0x7f, 0x06, 0x01, 0xf7)
+
+IDENTITY_REPLY = (0xf0, 0x7e, 0x00, 0x06, 0x02, 0x00, 0x20, 0x76,
+                  0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0xf7)
+
+
+class CInstance(object):
+    """Stand-in for the c_instance object Live hands to create_instance."""
+
+    def __init__(self, song, echo_log=False):
+        self._song = song
+        self.echo_log = echo_log
+        self.sent = []
+        self.log = []
+        self.messages = []
+        self.rebuild_requests = 0
+
+        # kept apart from sent, which measurements clear
+        self.identity_requests = 0
+
+    def song(self):
+        return self._song
+
+    def send_midi(self, midi_bytes):
+        midi_bytes = tuple(midi_bytes)
+        if midi_bytes == IDENTITY_REQUEST:
+            self.identity_requests += 1
+        self.sent.append((time.time(), midi_bytes))
+
+    def log_message(self, message):
+        self.log.append(message)
+        if self.echo_log:
+            print(message)
+
+    def show_message(self, message):
+        self.messages.append(message)
+
+    def request_rebuild_midi_map(self):
+        self.rebuild_requests += 1
+
+    def set_session_highlight(self, *a):
+        pass
+
+
+def build_song(num_tracks=8, num_scenes=8, num_returns=2, clip_every=3):
+    """Create a song with `num_tracks` x `num_scenes` slots, a clip in
+    every `clip_every`-th slot (0 disables clips)."""
+    song = Live.Song.Song()
+    for s in range(num_scenes):
+        song.create_scene(name='Scene %d' % (s + 1))
+    for t in range(num_tracks):
+        track = song.create_midi_track(name='Track %d' % (t + 1))
+        if clip_every:
+            for s, slot in enumerate(track.clip_slots):
+                if (t + s) % clip_every == 0:
+                    slot.create_clip(color=(t * 0x0f1e2d + s * 0x030201) & 0xffffff)
+    for r in range(num_returns):
+        song.create_return_track(name='Return %s' % chr(ord('A') + r))
+    song.view.selected_track = song.tracks[0] if song.tracks else song.master_track
+    if song.scenes:
+        song.view.selected_scene = song.scenes[0]
+    return song
+
+
+class Harness(object):
+    """Runs one OP-1 surface instance against a stand-in song."""
+
+    def __init__(self, song=None, echo_log=False, connect=True):
+        Live.Application.reset_application()
+        self.song = song if song is not None else build_song()
+        self.c_instance = CInstance(self.song, echo_log=echo_log)
+
+        # answering identity requests sent on ticks, the probes as well as
+        # the keep-alives, like a connected OP-1 does. Without answers the
+        # surface drops the connection after HANDSHAKE_KEEPALIVE_TIMEOUT_TICKS
+        self.answer_identity = connect
+
+        import op1
+        self.surface = op1.create_instance(self.c_instance)
+        self.rebuild()
+        if connect:
+            self.tick(2)
+
+    @property
+    def app(self):
+        return Live.Application.get_application()
+
+    # MIDI injection
+
+    def cc(self, identifier, value, channel=0):
+        self.surface.receive_midi((0xb0 + channel, identifier, value))
+
+    def note(self, identifier, velocity, channel=0):
+        self.surface.receive_midi((0x90 + channel, identifier, velocity))
+
+    def press(self, identifier, channel=0):
+        self.cc(identifier, 127, channel)
+        self.cc(identifier, 0, channel)
+
+    def press_note(self, identifier, channel=0):
+        self.note(identifier, 127, channel)
+        self.note(identifier, 0, channel)
+
+    def turn(self, identifier, steps, channel=0):
+        """Send relative two's complement encoder messages, one per detent
+        (+/-4, like the OP-1)."""
+        value = 4 if steps > 0 else 124
+        for _ in range(abs(steps)):
+            self.cc(identifier, value, channel)
+
+    def sysex(self, midi_bytes):
+        self.surface.receive_midi(tuple(midi_bytes))
+
+    def identity_reply(self):
+        self.sysex(IDENTITY_REPLY)
+
+    def set_mode(self, mode):
+        from op1 import consts
+        button = (consts.OP1_MODE_1_BUTTON, consts.OP1_MODE_2_BUTTON,
+                  consts.OP1_MODE_3_BUTTON, consts.OP1_MODE_4_BUTTON)[mode]
+        self.press(button)
+
+    # Live callbacks
+
+    def tick(self, count=1):
+        for _ in range(count):
+            requests = self.c_instance.identity_requests
+            self.surface.update_display()
+            if self.answer_identity and (self.c_instance.identity_requests > requests):
+                self.identity_reply()
+
+    def rebuild(self):
+        self.c_instance.rebuild_requests = 0
+        self.surface.build_midi_map(None)
+
+    def disconnect(self):
+        self.surface.disconnect()
+
+    # measurements
+
+    def sent_sysex(self):
+        return [m for _, m in self.c_instance.sent if m and m[0] == 0xf0]
+
+    def clear_stats(self):
+        API_CALLS.clear()
+        del self.c_instance.sent[:]
+
+    @staticmethod
+    def api_calls(prefix=''):
+        return dict((k, v) for k, v in API_CALLS.items() if k.startswith(prefix))
+
+
+def timed(func, *a, **k):
+    """Run func and return (result, seconds)."""
+    start = time.time()
+    result = func(*a, **k)
+    return result, time.time() - start
@@ -0,0 +1,97 @@
+from .Base import LiveObject, count
+
+_VIEWS = ('Browser', 'Arranger', 'Session', 'Detail', 'Detail/Clip', 'Detail/DeviceChain')
+
+
+class Application(LiveObject):
+
+    class View(LiveObject):
+
+        class NavDirection(object):
+            up = 0
+            down = 1
+            left = 2
+            right = 3
+
+        def __init__(self):
+            LiveObject.__init__(self)
+            self._visible = set(['Session', 'Detail', 'Detail/Clip'])
+            self._view_listeners = {}
+
+        def is_view_visible(self, identifier, main_window_only=True):
+            count('Application.View.is_view_visible')
+            return identifier in self._visible
+
+        def show_view(self, identifier):
+            count('Application.View.show_view')
+            changed = []
+            if identifier in ('Session', 'Arranger'):
+                other = 'Arranger' if identifier == 'Session' else 'Session'
+                if other in self._visible:
+                    self._visible.discard(other)
+                    changed.append(other)
+            if identifier not in self._visible:
+                self._visible.add(identifier)
+                changed.append(identifier)
+            for name in changed:
+                self._notify_view(name)
+
+        def hide_view(self, identifier):
+            count('Application.View.hide_view')
+            if identifier in self._visible:
+                self._visible.discard(identifier)
+                self._notify_view(identifier)
+
+        def focus_view(self, identifier):
+            count('Application.View.focus_view')
+
+        def scroll_view(self, direction, identifier, modifier_pressed):
+            count('Application.View.scroll_view')
+
+        def zoom_view(self, direction, identifier, modifier_pressed):
+            count('Application.View.zoom_view')
+
+        def add_is_view_visible_listener(self, identifier, callback):
+            count('Application.View.add_is_view_visible_listener')
+            listeners = self._view_listeners.setdefault(identifier, [])
+            if callback in listeners:
+                raise RuntimeError('Listener already connected')
+            listeners.append(callback)
+
+        def remove_is_view_visible_listener(self, identifier, callback):
+            count('Application.View.remove_is_view_visible_listener')
+            self._view_listeners.get(identifier, []).remove(callback)
+
+        def is_view_visible_has_listener(self, identifier, callback):
+            return callback in self._view_listeners.get(identifier, ())
+
+        def _notify_view(self, identifier):
+            for callback in list(self._view_listeners.get(identifier, ())):
+                callback()
+
+    def __init__(self):
+        LiveObject.__init__(self)
+        self.view = Application.View()
+
+    def get_major_version(self):
+        return 10
+
+    def get_minor_version(self):
+        return 1
+
+    def get_bugfix_version(self):
+        return 0
+
+
+_application = [None]
+
+
+def get_application():
+    if _application[0] is None:
+        _application[0] = Application()
+    return _application[0]
+
+
+def reset_application():
+    _application[0] = Application()
+    return _application[0]
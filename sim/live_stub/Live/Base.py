@@ -0,0 +1,108 @@
+"""Listener plumbing shared by all stand-in Live objects."""
+
+import collections
+
+# every Live API access made through the stand-ins is counted here,
+# keyed by "Class.member", so drivers can report API traffic
+API_CALLS = collections.Counter()
+
+
+def count(key):
+    API_CALLS[key] += 1
+
+
+class LiveObject(object):
+    """A Live object that can die and that supports the generated
+    add_<prop>_listener / remove_<prop>_listener / <prop>_has_listener
+    methods of the real API. Dead objects compare equal to None,
+    exactly like objects handed out by Live."""
+
+    def __init__(self):
+        self._listeners = {}
+        self._values = {}
+        self._alive = True
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name.startswith('add_') and name.endswith('_listener'):
+            prop = name[4:-9]
+            return lambda callback: self._add_listener(prop, callback)
+        if name.startswith('remove_') and name.endswith('_listener'):
+            prop = name[7:-9]
+            return lambda callback: self._remove_listener(prop, callback)
+        if name.endswith('_has_listener'):
+            prop = name[:-13]
+            return lambda callback: self._has_listener(prop, callback)
+        raise AttributeError(name)
+
+    def _add_listener(self, prop, callback):
+        count('%s.add_%s_listener' % (self.__class__.__name__, prop))
+        listeners = self._listeners.setdefault(prop, [])
+        if callback in listeners:
+            raise RuntimeError('Listener already connected')
+        listeners.append(callback)
+
+    def _remove_listener(self, prop, callback):
+        count('%s.remove_%s_listener' % (self.__class__.__name__, prop))
+        listeners = self._listeners.get(prop, [])
+        if callback not in listeners:
+            raise RuntimeError('Listener not connected')
+        listeners.remove(callback)
+
+    def _has_listener(self, prop, callback):
+        return callback in self._listeners.get(prop, ())
+
+    def listener_count(self, prop=None):
+        if prop is not None:
+            return len(self._listeners.get(prop, ()))
+        return sum(len(callbacks) for callbacks in self._listeners.values())
+
+    def notify(self, prop):
+        for callback in list(self._listeners.get(prop, ())):
+            callback()
+
+    def kill(self):
+        self._alive = False
+        self._listeners = {}
+
+    def __eq__(self, other):
+        if other is None:
+            return not self._alive
+        return self is other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = object.__hash__
+
+
+class observable_property(object):
+    """Data descriptor that notifies <name> listeners when the value changes."""
+
+    def __init__(self, name, default=None, read_only=False):
+        self.name = name
+        self.default = default
+        self.read_only = read_only
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        count('%s.%s' % (obj.__class__.__name__, self.name))
+        return obj._values.get(self.name, self.default)
+
+    def __set__(self, obj, value):
+        if self.read_only:
+            raise AttributeError(self.name + ' is read only')
+        count('%s.%s=' % (obj.__class__.__name__, self.name))
+        obj._set(self.name, value)
+
+
+def _set(self, name, value):
+    old = self._values.get(name, getattr(type(self), name).default)
+    self._values[name] = value
+    if old != value:
+        self.notify(name)
+
+
+LiveObject._set = _set
@@ -0,0 +1,13 @@
+from .Base import LiveObject, observable_property
+
+
+class Clip(LiveObject):
+    color = observable_property('color', 0)
+    name = observable_property('name', '')
+    is_playing = observable_property('is_playing', False)
+
+    def __init__(self, canonical_parent, color=0, name=''):
+        LiveObject.__init__(self)
+        self.canonical_parent = canonical_parent
+        self._values['color'] = color
+        self._values['name'] = name
@@ -0,0 +1,39 @@
+from .Base import LiveObject, count, observable_property
+from .Clip import Clip
+
+
+class ClipSlot(LiveObject):
+    has_clip = observable_property('has_clip', False, read_only=True)
+
+    def __init__(self, canonical_parent):
+        LiveObject.__init__(self)
+        self.canonical_parent = canonical_parent
+        self._clip = None
+
+    @property
+    def clip(self):
+        count('ClipSlot.clip')
+        return self._clip
+
+    def create_clip(self, length=4.0, color=0):
+        assert self._clip is None
+        self._clip = Clip(self, color=color)
+        self._set('has_clip', True)
+        return self._clip
+
+    def delete_clip(self):
+        if self._clip is not None:
+            self._clip.kill()
+            self._clip = None
+            self._set('has_clip', False)
+
+    def fire(self):
+        count('ClipSlot.fire')
+
+    def stop(self):
+        count('ClipSlot.stop')
+
+    def kill(self):
+        if self._clip is not None:
+            self._clip.kill()
+        LiveObject.kill(self)
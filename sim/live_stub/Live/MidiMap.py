@@ -0,0 +1,7 @@
+class MapMode(object):
+    absolute = 0
+    absolute_14_bit = 1
+    relative_signed_bit = 2
+    relative_binary_offset = 3
+    relative_signed_bit2 = 4
+    relative_two_compliment = 5
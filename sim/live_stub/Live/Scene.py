@@ -0,0 +1,19 @@
+from .Base import LiveObject, count, observable_property
+
+
+class Scene(LiveObject):
+    name = observable_property('name', '')
+
+    def __init__(self, canonical_parent, name=''):
+        LiveObject.__init__(self)
+        self.canonical_parent = canonical_parent
+        self._values['name'] = name
+
+    @property
+    def clip_slots(self):
+        song = self.canonical_parent
+        index = list(song.scenes).index(self)
+        return tuple(t.clip_slots[index] for t in song.tracks)
+
+    def fire(self):
+        count('Scene.fire')
@@ -0,0 +1,193 @@
+from .Base import LiveObject, count, observable_property
+from .Scene import Scene
+from .Track import Track
+
+
+class Quantization(object):
+    q_no_q = 0
+    q_8_bars = 1
+    q_4_bars = 2
+    q_2_bars = 3
+    q_bar = 4
+    q_half = 5
+    q_half_triplet = 6
+    q_quarter = 7
+    q_quarter_triplet = 8
+    q_eight = 9
+    q_eight_triplet = 10
+    q_sixtenth = 11
+    q_sixtenth_triplet = 12
+    q_thirtytwoth = 13
+
+
+class BeatTime(object):
+    def __init__(self, beats):
+        self.bars = int(beats // 4) + 1
+        self.beats = int(beats % 4) + 1
+        self.sub_division = int((beats * 4) % 4) + 1
+        self.ticks = int((beats * 240) % 60)
+
+    def __str__(self):
+        return '%d.%d.%d.%03d' % (self.bars, self.beats, self.sub_division, self.ticks)
+
+
+class SongView(LiveObject):
+    selected_track = observable_property('selected_track')
+    selected_scene = observable_property('selected_scene')
+    follow_song = observable_property('follow_song', False)
+
+    def __init__(self, song):
+        LiveObject.__init__(self)
+        self.canonical_parent = song
+
+
+class Song(LiveObject):
+    is_playing = observable_property('is_playing', False)
+    record_mode = observable_property('record_mode', False)
+    tempo = observable_property('tempo', 120.0)
+    clip_trigger_quantization = observable_property('clip_trigger_quantization',
+                                                    Quantization.q_bar)
+    current_song_time = observable_property('current_song_time', 0.0)
+    back_to_arranger = observable_property('back_to_arranger', False)
+    punch_in = observable_property('punch_in', False)
+    punch_out = observable_property('punch_out', False)
+    loop = observable_property('loop', False)
+    loop_start = observable_property('loop_start', 0.0)
+    loop_length = observable_property('loop_length', 16.0)
+    metronome = observable_property('metronome', False)
+    overdub = observable_property('overdub', False)
+
+    def __init__(self):
+        LiveObject.__init__(self)
+        self.view = SongView(self)
+        self._tracks = []
+        self._return_tracks = []
+        self._scenes = []
+        self.master_track = Track(self, name='Master', can_be_armed=False)
+
+    # containers
+
+    @property
+    def tracks(self):
+        count('Song.tracks')
+        return tuple(self._tracks)
+
+    @property
+    def return_tracks(self):
+        count('Song.return_tracks')
+        return tuple(self._return_tracks)
+
+    @property
+    def visible_tracks(self):
+        count('Song.visible_tracks')
+        return tuple(t for t in self._tracks if t.is_visible)
+
+    @property
+    def scenes(self):
+        count('Song.scenes')
+        return tuple(self._scenes)
+
+    @property
+    def loop_end(self):
+        return self.loop_start + self.loop_length
+
+    @loop_end.setter
+    def loop_end(self, value):
+        self.loop_length = value - self.loop_start
+
+    def create_midi_track(self, index=-1, name='', group_track=None, is_foldable=False):
+        index = len(self._tracks) if index == -1 else index
+        track = Track(self, name=name, group_track=group_track,
+                      is_foldable=is_foldable, can_be_armed=not is_foldable,
+                      num_slots=len(self._scenes))
+        self._tracks.insert(index, track)
+        self.notify('tracks')
+        self.notify('visible_tracks')
+        return track
+
+    create_audio_track = create_midi_track
+
+    def create_return_track(self, name=''):
+        track = Track(self, name=name, can_be_armed=False)
+        self._return_tracks.append(track)
+        self.notify('return_tracks')
+        return track
+
+    def delete_track(self, index):
+        track = self._tracks.pop(index)
+        was_selected = self.view.selected_track is track
+        track.kill()
+        if was_selected:
+            self.view.selected_track = self._tracks[0] if self._tracks else self.master_track
+        self.notify('tracks')
+        self.notify('visible_tracks')
+
+    def create_scene(self, index=-1, name=''):
+        index = len(self._scenes) if index == -1 else index
+        scene = Scene(self, name=name)
+        self._scenes.insert(index, scene)
+        for track in self._tracks:
+            track._insert_slot(index)
+        self.notify('scenes')
+        return scene
+
+    def delete_scene(self, index):
+        scene = self._scenes.pop(index)
+        was_selected = self.view.selected_scene is scene
+        scene.kill()
+        for track in self._tracks:
+            track._delete_slot(index)
+        if was_selected and self._scenes:
+            self.view.selected_scene = self._scenes[min(index, len(self._scenes) - 1)]
+        self.notify('scenes')
+
+    # transport
+
+    def get_current_beats_song_time(self):
+        count('Song.get_current_beats_song_time')
+        return BeatTime(self.current_song_time)
+
+    def start_playing(self):
+        count('Song.start_playing')
+        self.is_playing = True
+
+    def stop_playing(self):
+        count('Song.stop_playing')
+        self.is_playing = False
+
+    def continue_playing(self):
+        count('Song.continue_playing')
+        self.is_playing = True
+
+    def play_selection(self):
+        count('Song.play_selection')
+        self.is_playing = True
+
+    def scrub_by(self, beats):
+        count('Song.scrub_by')
+        self.current_song_time = max(0.0, self.current_song_time + beats)
+
+    def jump_by(self, beats):
+        count('Song.jump_by')
+        self.current_song_time = max(0.0, self.current_song_time + beats)
+
+    def jump_to_next_cue(self):
+        count('Song.jump_to_next_cue')
+
+    def jump_to_prev_cue(self):
+        count('Song.jump_to_prev_cue')
+
+    def set_or_delete_cue(self):
+        count('Song.set_or_delete_cue')
+
+    def stop_all_clips(self, quantized=True):
+        count('Song.stop_all_clips')
+
+    def tap_tempo(self):
+        count('Song.tap_tempo')
+
+    def undo(self):
+        count('Song.undo')
+
+    def redo(self):
+        count('Song.redo')
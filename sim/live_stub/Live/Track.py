@@ -0,0 +1,68 @@
+from .Base import LiveObject, count, observable_property
+from .ClipSlot import ClipSlot
+
+
+class Track(LiveObject):
+    name = observable_property('name', '')
+    arm = observable_property('arm', False)
+    solo = observable_property('solo', False)
+    mute = observable_property('mute', False)
+    fold_state = observable_property('fold_state', 0)
+    color = observable_property('color', 0)
+
+    def __init__(self, canonical_parent, name='', can_be_armed=True,
+                 is_foldable=False, group_track=None, num_slots=0):
+        LiveObject.__init__(self)
+        self.canonical_parent = canonical_parent
+        self._values['name'] = name
+        self._can_be_armed = can_be_armed
+        self._is_foldable = is_foldable
+        self._group_track = group_track
+        self._clip_slots = [ClipSlot(self) for _ in range(num_slots)]
+
+    @property
+    def can_be_armed(self):
+        count('Track.can_be_armed')
+        return self._can_be_armed
+
+    @property
+    def is_foldable(self):
+        return self._is_foldable
+
+    @property
+    def is_grouped(self):
+        return self._group_track is not None
+
+    @property
+    def group_track(self):
+        return self._group_track
+
+    @property
+    def is_visible(self):
+        group = self._group_track
+        while group is not None:
+            if group.fold_state:
+                return False
+            group = group.group_track
+        return True
+
+    @property
+    def clip_slots(self):
+        count('Track.clip_slots')
+        return tuple(self._clip_slots)
+
+    def _insert_slot(self, index):
+        self._clip_slots.insert(index, ClipSlot(self))
+        self.notify('clip_slots')
+
+    def _delete_slot(self, index):
+        self._clip_slots.pop(index).kill()
+        self.notify('clip_slots')
+
+    def stop_all_clips(self):
+        count('Track.stop_all_clips')
+
+    def kill(self):
+        for slot in self._clip_slots:
+            slot.kill()
+        LiveObject.kill(self)
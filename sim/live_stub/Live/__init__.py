@@ -0,0 +1,11 @@
+"""Pure-Python stand-in for the parts of Ableton Live's `Live` module
+that the OP-1 surface uses. Only meant for running the surface headless."""
+
+from . import Base  # noqa: F401
+from . import Clip  # noqa: F401
+from . import ClipSlot  # noqa: F401
+from . import Track  # noqa: F401
+from . import Scene  # noqa: F401
+from . import Song  # noqa: F401
+from . import Application  # noqa: F401
+from . import MidiMap  # noqa: F401
@@ -0,0 +1,20 @@
+from .InputControlElement import InputControlElement
+
+
+class ButtonElement(InputControlElement):
+
+    def __init__(self, is_momentary, msg_type, channel, identifier, *a, **k):
+        InputControlElement.__init__(self, msg_type, channel, identifier, *a, **k)
+        self._is_momentary = bool(is_momentary)
+
+    def is_momentary(self):
+        return self._is_momentary
+
+    def is_pressed(self):
+        return self._is_momentary and bool(self._last_value)
+
+    def turn_on(self):
+        self.send_value(127)
+
+    def turn_off(self):
+        self.send_value(0)
@@ -0,0 +1,70 @@
+from Live.Base import count
+
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class ChannelStripComponent(ControlSurfaceComponent):
+
+    def __init__(self):
+        ControlSurfaceComponent.__init__(self)
+        self._track = None
+        self._volume_control = None
+        self._pan_control = None
+        self._send_controls = None
+        self._mute_button = None
+        self._solo_button = None
+        self._arm_button = None
+        self._select_button = None
+
+    def set_track(self, track):
+        count('ChannelStripComponent.set_track')
+        self._track = track
+
+    def _set_button(self, attr, button, handler):
+        old = getattr(self, attr)
+        if button != old:
+            if old is not None:
+                old.remove_value_listener(handler)
+            setattr(self, attr, button)
+            if button is not None:
+                button.add_value_listener(handler)
+
+    def set_volume_control(self, control):
+        count('ChannelStripComponent.set_volume_control')
+        self._volume_control = control
+
+    def set_pan_control(self, control):
+        count('ChannelStripComponent.set_pan_control')
+        self._pan_control = control
+
+    def set_send_controls(self, controls):
+        count('ChannelStripComponent.set_send_controls')
+        self._send_controls = controls
+
+    def set_mute_button(self, button):
+        count('ChannelStripComponent.set_mute_button')
+        self._set_button('_mute_button', button, self._mute_value)
+
+    def set_solo_button(self, button):
+        count('ChannelStripComponent.set_solo_button')
+        self._set_button('_solo_button', button, self._solo_value)
+
+    def set_arm_button(self, button):
+        count('ChannelStripComponent.set_arm_button')
+        self._set_button('_arm_button', button, self._arm_value)
+
+    def set_select_button(self, button):
+        count('ChannelStripComponent.set_select_button')
+        self._select_button = button
+
+    def _mute_value(self, value):
+        if value and self._track is not None:
+            self._track.mute = not self._track.mute
+
+    def _solo_value(self, value):
+        if value and self._track is not None:
+            self._track.solo = not self._track.solo
+
+    def _arm_value(self, value):
+        if value and self._track is not None and self._track.can_be_armed:
+            self._track.arm = not self._track.arm
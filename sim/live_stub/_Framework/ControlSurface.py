@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+
+import Live
+from Live.Base import count
+
+from .InputControlElement import MIDI_CC_TYPE, MIDI_NOTE_TYPE, set_active_surface
+
+
+class ControlSurface(object):
+    """Headless stand-in for Ableton's ControlSurface base class."""
+
+    def __init__(self, c_instance, *a, **k):
+        self._c_instance = c_instance
+        self._controls = []
+        self._forwarding = {}
+        self._scheduled = []
+        self._highlighting_session_component = None
+        set_active_surface(self)
+
+    @contextmanager
+    def component_guard(self):
+        set_active_surface(self)
+        yield
+
+    def song(self):
+        return self._c_instance.song()
+
+    def application(self):
+        return Live.Application.get_application()
+
+    def show_message(self, message):
+        self._c_instance.show_message(message)
+
+    def log_message(self, *message):
+        self._c_instance.log_message(' '.join(map(str, message)))
+
+    def _register_control(self, control):
+        self._controls.append(control)
+        key = (control.message_type(), control.message_channel(),
+               control.message_identifier())
+        self._forwarding.setdefault(key, []).append(control)
+
+    def _send_midi(self, midi_event_bytes, optimized=None):
+        count('ControlSurface._send_midi')
+        self._c_instance.send_midi(midi_event_bytes)
+        return True
+
+    def schedule_message(self, delay_in_ticks, callback, parameter=None):
+        self._scheduled.append([delay_in_ticks, callback, parameter])
+
+    def update_display(self):
+        due = [task for task in self._scheduled if task[0] <= 1]
+        for task in self._scheduled:
+            task[0] -= 1
+        self._scheduled = [task for task in self._scheduled if task[0] > 0]
+        for _, callback, parameter in due:
+            if parameter is None:
+                callback()
+            else:
+                callback(parameter)
+
+    def receive_midi(self, midi_bytes):
+        if len(midi_bytes) != 3:
+            self.handle_sysex(midi_bytes)
+            return
+        status, identifier, value = midi_bytes
+        channel = status & 15
+        kind = status & 240
+        if kind in (144, 128):
+            msg_type = MIDI_NOTE_TYPE
+            if kind == 128:
+                value = 0
+        elif kind == 176:
+            msg_type = MIDI_CC_TYPE
+        else:
+            return
+        for control in list(self._forwarding.get((msg_type, channel, identifier), ())):
+            control.receive_value(value)
+
+    def handle_sysex(self, midi_bytes):
+        pass
+
+    def build_midi_map(self, midi_map_handle):
+        count('ControlSurface.build_midi_map')
+
+    def request_rebuild_midi_map(self):
+        self._c_instance.request_rebuild_midi_map()
+
+    def set_highlighting_session_component(self, session_component):
+        self._highlighting_session_component = session_component
+
+    def refresh_state(self):
+        pass
+
+    def suggest_input_port(self):
+        return ''
+
+    def suggest_output_port(self):
+        return ''
+
+    def can_lock_to_devices(self):
+        return False
+
+    def disconnect(self):
+        set_active_surface(None)
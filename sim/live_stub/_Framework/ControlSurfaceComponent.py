@@ -0,0 +1,27 @@
+import Live
+
+
+class ControlSurfaceComponent(object):
+
+    def __init__(self, *a, **k):
+        self._is_enabled = True
+
+    def song(self):
+        from .InputControlElement import _surface
+        return _surface[0].song()
+
+    def application(self):
+        return Live.Application.get_application()
+
+    def is_enabled(self):
+        return self._is_enabled
+
+    def set_enabled(self, enable):
+        self._is_enabled = bool(enable)
+        self.update()
+
+    def update(self):
+        pass
+
+    def disconnect(self):
+        pass
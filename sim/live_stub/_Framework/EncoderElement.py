@@ -0,0 +1,11 @@
+from .InputControlElement import InputControlElement
+
+
+class EncoderElement(InputControlElement):
+
+    def __init__(self, msg_type, channel, identifier, map_mode, *a, **k):
+        InputControlElement.__init__(self, msg_type, channel, identifier, *a, **k)
+        self._map_mode = map_mode
+
+    def message_map_mode(self):
+        return self._map_mode
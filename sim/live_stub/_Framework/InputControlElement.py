@@ -0,0 +1,78 @@
+from Live.Base import count
+
+MIDI_NOTE_TYPE = 0
+MIDI_CC_TYPE = 1
+MIDI_PB_TYPE = 2
+MIDI_SYSEX_TYPE = 3
+
+MIDI_NOTE_ON_STATUS = 144
+MIDI_NOTE_OFF_STATUS = 128
+MIDI_CC_STATUS = 176
+
+_surface = [None]
+
+
+def set_active_surface(surface):
+    _surface[0] = surface
+
+
+class InputControlElement(object):
+    """Control element that forwards incoming values to its value listeners.
+    Elements register themselves with the most recently created surface."""
+
+    def __init__(self, msg_type, channel, identifier, *a, **k):
+        count('InputControlElement.__init__')
+        self._msg_type = msg_type
+        self._msg_channel = channel
+        self._msg_identifier = identifier
+        self._value_listeners = []
+        self._last_value = None
+        self.name = k.get('name', '')
+        if _surface[0] is not None:
+            _surface[0]._register_control(self)
+
+    def message_type(self):
+        return self._msg_type
+
+    def message_channel(self):
+        return self._msg_channel
+
+    def message_identifier(self):
+        return self._msg_identifier
+
+    def add_value_listener(self, callback, identify_sender=False):
+        count('InputControlElement.add_value_listener')
+        for listener, _ in self._value_listeners:
+            if listener == callback:
+                count('InputControlElement.add_value_listener.duplicate')
+                return
+        self._value_listeners.append((callback, identify_sender))
+
+    def remove_value_listener(self, callback):
+        count('InputControlElement.remove_value_listener')
+        for entry in self._value_listeners:
+            if entry[0] == callback:
+                self._value_listeners.remove(entry)
+                return
+
+    def value_has_listener(self, callback):
+        return any(listener == callback for listener, _ in self._value_listeners)
+
+    def value_listener_count(self):
+        return len(self._value_listeners)
+
+    def receive_value(self, value):
+        self._last_value = value
+        for listener, identify_sender in list(self._value_listeners):
+            if identify_sender:
+                listener(value, self)
+            else:
+                listener(value)
+
+    def send_value(self, value, force=False):
+        if _surface[0] is not None:
+            status = MIDI_CC_STATUS if self._msg_type == MIDI_CC_TYPE else MIDI_NOTE_ON_STATUS
+            _surface[0]._send_midi((status + self._msg_channel, self._msg_identifier, value))
+
+    def reset(self):
+        pass
@@ -0,0 +1,72 @@
+from .ChannelStripComponent import ChannelStripComponent
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class MixerComponent(ControlSurfaceComponent):
+
+    def __init__(self, num_tracks, num_returns=0, *a, **k):
+        ControlSurfaceComponent.__init__(self)
+        self._channel_strips = [ChannelStripComponent() for _ in range(num_tracks)]
+        self._return_strips = [ChannelStripComponent() for _ in range(num_returns)]
+        self._selected_strip = ChannelStripComponent()
+        self._track_offset = 0
+        self._next_button = None
+        self._prev_button = None
+        song = self.song()
+        song.add_visible_tracks_listener(self._reassign_tracks)
+        song.add_return_tracks_listener(self._reassign_tracks)
+        song.view.add_selected_track_listener(self._on_selected_track_changed)
+        self._reassign_tracks()
+        self._on_selected_track_changed()
+
+    def channel_strip(self, index):
+        return self._channel_strips[index]
+
+    def return_strip(self, index):
+        return self._return_strips[index]
+
+    def selected_strip(self):
+        return self._selected_strip
+
+    def tracks_to_use(self):
+        return self.song().visible_tracks
+
+    def _reassign_tracks(self):
+        tracks = self.tracks_to_use()
+        for index, strip in enumerate(self._channel_strips):
+            track_index = self._track_offset + index
+            strip.set_track(tracks[track_index] if track_index < len(tracks) else None)
+        returns = self.song().return_tracks
+        for index, strip in enumerate(self._return_strips):
+            strip.set_track(returns[index] if index < len(returns) else None)
+
+    def _on_selected_track_changed(self):
+        self._selected_strip.set_track(self.song().view.selected_track)
+
+    def set_select_buttons(self, next_button, prev_button):
+        for old, handler in ((self._next_button, self._next_value),
+                             (self._prev_button, self._prev_value)):
+            if old is not None:
+                old.remove_value_listener(handler)
+        self._next_button = next_button
+        self._prev_button = prev_button
+        if next_button is not None:
+            next_button.add_value_listener(self._next_value)
+        if prev_button is not None:
+            prev_button.add_value_listener(self._prev_value)
+
+    def _select(self, delta):
+        song = self.song()
+        tracks = song.visible_tracks + song.return_tracks + (song.master_track,)
+        selected = song.view.selected_track
+        index = list(tracks).index(selected) if selected in tracks else 0
+        index = max(0, min(len(tracks) - 1, index + delta))
+        song.view.selected_track = tracks[index]
+
+    def _next_value(self, value):
+        if value:
+            self._select(1)
+
+    def _prev_value(self, value):
+        if value:
+            self._select(-1)
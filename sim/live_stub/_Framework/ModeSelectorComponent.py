@@ -0,0 +1,49 @@
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class ModeSelectorComponent(ControlSurfaceComponent):
+
+    def __init__(self, *a, **k):
+        ControlSurfaceComponent.__init__(self)
+        self._modes_buttons = []
+        self._mode_index = 0
+        self._mode_listeners = []
+
+    def number_of_modes(self):
+        raise NotImplementedError
+
+    @property
+    def mode_index(self):
+        return self._mode_index
+
+    def set_mode_buttons(self, buttons):
+        for button in self._modes_buttons:
+            button.remove_value_listener(self._mode_value)
+        self._modes_buttons = list(buttons) if buttons is not None else []
+        for button in self._modes_buttons:
+            button.add_value_listener(self._mode_value, identify_sender=True)
+
+    def _mode_value(self, value, sender):
+        if value != 0 or not sender.is_momentary():
+            self.set_mode(self._modes_buttons.index(sender))
+
+    def set_mode(self, mode):
+        if self._mode_index != mode:
+            self._mode_index = mode
+            self.update()
+            for listener in list(self._mode_listeners):
+                listener()
+
+    def add_mode_index_listener(self, listener):
+        self._mode_listeners.append(listener)
+
+    def remove_mode_index_listener(self, listener):
+        if listener in self._mode_listeners:
+            self._mode_listeners.remove(listener)
+
+    def mode_index_has_listener(self, listener):
+        return listener in self._mode_listeners
+
+    def disconnect(self):
+        self.set_mode_buttons(None)
+        self._mode_listeners = []
@@ -0,0 +1,167 @@
+from Live.Base import count
+
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class ClipSlotComponent(ControlSurfaceComponent):
+
+    def __init__(self):
+        ControlSurfaceComponent.__init__(self)
+        self._clip_slot = None
+        self._launch_button = None
+
+    def set_clip_slot(self, clip_slot):
+        self._clip_slot = clip_slot
+
+    def has_clip(self):
+        return self._clip_slot is not None and self._clip_slot.has_clip
+
+    def set_launch_button(self, button):
+        count('ClipSlotComponent.set_launch_button')
+        if button != self._launch_button:
+            if self._launch_button is not None:
+                self._launch_button.remove_value_listener(self._launch_value)
+            self._launch_button = button
+            if button is not None:
+                button.add_value_listener(self._launch_value)
+
+    def _launch_value(self, value):
+        if value and self._clip_slot is not None:
+            self._clip_slot.fire()
+
+
+class SceneComponent(ControlSurfaceComponent):
+
+    def __init__(self, num_slots):
+        ControlSurfaceComponent.__init__(self)
+        self._clip_slots = [ClipSlotComponent() for _ in range(num_slots)]
+        self._scene = None
+        self._launch_button = None
+
+    def clip_slot(self, index):
+        return self._clip_slots[index]
+
+    def set_scene(self, scene):
+        self._scene = scene
+
+    def set_track_offset(self, offset, tracks, scene_index):
+        for index, slot in enumerate(self._clip_slots):
+            track_index = offset + index
+            if scene_index is not None and track_index < len(tracks):
+                slot.set_clip_slot(tracks[track_index].clip_slots[scene_index])
+            else:
+                slot.set_clip_slot(None)
+
+    def set_launch_button(self, button):
+        count('SceneComponent.set_launch_button')
+        self._launch_button = button
+
+
+class SessionComponent(ControlSurfaceComponent):
+
+    def __init__(self, num_tracks, num_scenes, *a, **k):
+        ControlSurfaceComponent.__init__(self)
+        self._num_tracks = num_tracks
+        self._scenes = [SceneComponent(num_tracks) for _ in range(num_scenes)]
+        self._track_offset = 0
+        self._scene_offset = 0
+        self._offset_listeners = []
+        self._bank_buttons = {}
+        song = self.song()
+        song.add_visible_tracks_listener(self._reassign_tracks)
+        song.add_scenes_listener(self._reassign_scenes)
+        self._reassign_scenes()
+
+    def scene(self, index):
+        return self._scenes[index]
+
+    def tracks_to_use(self):
+        return self.song().visible_tracks
+
+    def track_offset(self):
+        return self._track_offset
+
+    def scene_offset(self):
+        return self._scene_offset
+
+    def width(self):
+        return self._num_tracks
+
+    def height(self):
+        return len(self._scenes)
+
+    def set_offsets(self, track_offset, scene_offset):
+        track_offset = max(0, min(track_offset, len(self.tracks_to_use()) - 1))
+        scene_offset = max(0, min(scene_offset, len(self.song().scenes) - 1))
+        if (track_offset, scene_offset) != (self._track_offset, self._scene_offset):
+            self._track_offset = track_offset
+            self._scene_offset = scene_offset
+            self._reassign_scenes()
+            for listener in list(self._offset_listeners):
+                listener()
+
+    def add_offset_listener(self, listener):
+        self._offset_listeners.append(listener)
+
+    def remove_offset_listener(self, listener):
+        if listener in self._offset_listeners:
+            self._offset_listeners.remove(listener)
+
+    def offset_has_listener(self, listener):
+        return listener in self._offset_listeners
+
+    def _reassign_scenes(self):
+        scenes = self.song().scenes
+        for index, scene in enumerate(self._scenes):
+            scene_index = self._scene_offset + index
+            scene.set_scene(scenes[scene_index] if scene_index < len(scenes) else None)
+        self._reassign_tracks()
+
+    def _reassign_tracks(self):
+        tracks = self.tracks_to_use()
+        scenes = self.song().scenes
+        for index, scene in enumerate(self._scenes):
+            scene_index = self._scene_offset + index
+            scene.set_track_offset(self._track_offset, tracks,
+                                   scene_index if scene_index < len(scenes) else None)
+
+    def _set_bank_buttons(self, kind, buttons, handlers):
+        for button, handler in zip(self._bank_buttons.get(kind, (None, None)), handlers):
+            if button is not None:
+                button.remove_value_listener(handler)
+        self._bank_buttons[kind] = buttons
+        for button, handler in zip(buttons, handlers):
+            if button is not None:
+                button.add_value_listener(handler)
+
+    def set_track_bank_buttons(self, right_button, left_button):
+        count('SessionComponent.set_track_bank_buttons')
+        self._set_bank_buttons('track', (right_button, left_button),
+                               (self._bank_right_value, self._bank_left_value))
+
+    def set_scene_bank_buttons(self, down_button, up_button):
+        count('SessionComponent.set_scene_bank_buttons')
+        self._set_bank_buttons('scene', (down_button, up_button),
+                               (self._bank_down_value, self._bank_up_value))
+
+    def _bank_right_value(self, value):
+        if value:
+            self.set_offsets(self._track_offset + 1, self._scene_offset)
+
+    def _bank_left_value(self, value):
+        if value:
+            self.set_offsets(self._track_offset - 1, self._scene_offset)
+
+    def _bank_down_value(self, value):
+        if value:
+            self.set_offsets(self._track_offset, self._scene_offset + 1)
+
+    def _bank_up_value(self, value):
+        if value:
+            self.set_offsets(self._track_offset, self._scene_offset - 1)
+
+    def set_stop_all_clips_button(self, button):
+        count('SessionComponent.set_stop_all_clips_button')
+
+    def set_stop_track_clip_buttons(self, buttons):
+        count('SessionComponent.set_stop_track_clip_buttons')
@@ -0,0 +1,41 @@
+from Live.Base import count
+
+from .ControlSurfaceComponent import ControlSurfaceComponent
+
+
+class TransportComponent(ControlSurfaceComponent):
+
+    def __init__(self, *a, **k):
+        ControlSurfaceComponent.__init__(self)
+        self._buttons = {}
+
+    def _assign(self, name, *buttons):
+        count('TransportComponent.set_%s' % name)
+        self._buttons[name] = buttons
+
+    def set_stop_button(self, button):
+        self._assign('stop_button', button)
+
+    def set_play_button(self, button):
+        self._assign('play_button', button)
+
+    def set_record_button(self, button):
+        self._assign('record_button', button)
+
+    def set_metronome_button(self, button):
+        self._assign('metronome_button', button)
+
+    def set_tap_tempo_button(self, button):
+        self._assign('tap_tempo_button', button)
+
+    def set_loop_button(self, button):
+        self._assign('loop_button', button)
+
+    def set_overdub_button(self, button):
+        self._assign('overdub_button', button)
+
+    def set_punch_buttons(self, in_button, out_button):
+        self._assign('punch_buttons', in_button, out_button)
+
+    def set_seek_buttons(self, ffwd_button, rwd_button):
+        self._assign('seek_buttons', ffwd_button, rwd_button)
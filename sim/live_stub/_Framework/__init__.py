@@ -0,0 +1,2 @@
+"""Pure-Python stand-in for the subset of Ableton's `_Framework` package
+used by the OP-1 surface."""
@@ -0,0 +1,79 @@
+"""Records and replays OP-1 midi traces against the headless surface.
+
+    python sim/replay_trace.py record TRACE [repeats]
+    python sim/replay_trace.py replay TRACE [--realtime] [tracks] [scenes]
+
+`record` runs the midi driven phases of run_session.py with tracing on.
+`replay` feeds a trace, recorded here or in Live with MIDI_TRACE_PATH set,
+into a fresh surface at maximum (or the recorded) speed. It reports the
+time and API calls, and whether the surface sent the same midi as when the
+trace was recorded.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import driver  # noqa: E402
+import run_session  # noqa: E402
+from op1 import consts  # noqa: E402
+from op1.OP1Trace import OP1TraceReplayer, read_trace, RECORD_OUT  # noqa: E402
+
+# phases only driven by midi, song edits are not part of a trace
+RECORDED_PHASES = [run_session.switch_modes, run_session.scroll_tracks,
+                   run_session.turn_encoders]
+
+
+def record(path, repeats=20):
+    consts.MIDI_TRACE_PATH = path
+    try:
+        h = driver.Harness(driver.build_song(16, 16))
+        for phase in RECORDED_PHASES:
+            phase(h, repeats)
+        h.disconnect()
+    finally:
+        consts.MIDI_TRACE_PATH = None
+
+    print('recorded %d records to %s' % (len(read_trace(path)), path))
+
+
+def replay(path, realtime=False, tracks=16, scenes=16):
+    records = read_trace(path)
+    expected = [midi_bytes for (_, kind, midi_bytes) in records if kind == RECORD_OUT]
+
+    h = driver.Harness(driver.build_song(tracks, scenes), connect=False)
+    h.clear_stats()
+    replayer = OP1TraceReplayer(h.surface.receive_midi, h.surface.update_display)
+
+    (unused, seconds) = driver.timed(replayer.replay, records, realtime)
+    api_calls = sum(h.api_calls().values())
+    h.disconnect()
+
+    print('%d messages, %d ticks in %.2f ms (%.1f us per message), %d API calls' % (
+        replayer.messages, replayer.ticks, seconds * 1000,
+        seconds * 1e6 / max(replayer.messages, 1), api_calls))
+
+    # init frames were sent before clear_stats, disconnect frames after replaying
+    sent = [m for (_, m) in h.c_instance.sent]
+    if sent == expected[len(expected) - len(sent):]:
+        print('outbound midi identical (%d messages)' % len(sent))
+    else:
+        print('outbound midi differs: %d messages sent, %d recorded' % (
+            len(sent), len(expected)))
+
+
+def main(args):
+    if (len(args) >= 2) and (args[0] == 'record'):
+        record(args[1], *[int(a) for a in args[2:]])
+    elif (len(args) >= 2) and (args[0] == 'replay'):
+        realtime = '--realtime' in args
+        replay(args[1], realtime, *[int(a) for a in args[2:] if a != '--realtime'])
+    else:
+        print(__doc__)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
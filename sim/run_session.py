@@ -0,0 +1,118 @@
+"""Runs a scripted OP-1 session headless and reports timing, Live API
+traffic, sysex output (frames and bytes) and Python object counts for
+each phase.
+
+    python sim/run_session.py [tracks] [scenes] [repeats]
+
+Like the surface itself, the stand-in modules target Python 2.7.
+"""
+
+from __future__ import print_function
+
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import driver  # noqa: E402
+from op1 import consts  # noqa: E402
+
+NOTE_KEYS = [53, 55, 57, 59, 60, 62, 64, 65, 67, 69, 71, 72, 74, 76]
+
+
+def switch_modes(h, repeats):
+    for i in range(repeats):
+        for mode in range(consts.NUM_MODES):
+            h.set_mode(mode)
+            h.tick()
+
+
+def scroll_tracks(h, repeats):
+    h.set_mode(consts.OP1_MODE_MIXER)
+    for i in range(repeats):
+        for key in NOTE_KEYS:
+            h.press_note(key)
+            h.tick()
+
+
+def turn_encoders(h, repeats):
+    h.set_mode(consts.OP1_MODE_TRANSPORT)
+    for i in range(repeats):
+        h.turn(consts.OP1_ENCODER_1, 12)
+        h.turn(consts.OP1_ENCODER_3, -3)
+        h.turn(consts.OP1_ENCODER_4, 2)
+        h.tick()
+
+
+def play_transport(h, repeats):
+    h.set_mode(consts.OP1_MODE_TRANSPORT)
+    song = h.song
+    song.is_playing = True
+    for i in range(repeats * 10):
+        song.current_song_time += 0.1
+        h.tick()
+    song.is_playing = False
+
+
+def edit_clips(h, repeats):
+    h.set_mode(consts.OP1_MODE_CLIP)
+    song = h.song
+    for i in range(repeats):
+        track = song.tracks[i % len(song.tracks)]
+        slot = track.clip_slots[0]
+        if slot.has_clip:
+            slot.delete_clip()
+        else:
+            slot.create_clip(color=0x336699)
+        h.rebuild()
+        h.tick()
+
+
+def edit_song(h, repeats):
+    song = h.song
+    for i in range(repeats):
+        song.create_midi_track(name='Extra %d' % i)
+        h.rebuild()
+        h.tick()
+        song.delete_track(len(song.tracks) - 1)
+        h.rebuild()
+        h.tick()
+
+
+PHASES = [switch_modes, scroll_tracks, turn_encoders, play_transport, edit_clips, edit_song]
+
+
+def main(tracks=16, scenes=16, repeats=20):
+    song = driver.build_song(tracks, scenes)
+    (h, seconds) = driver.timed(driver.Harness, song)
+    print('%d tracks x %d scenes, startup %.2f ms' % (tracks, scenes, seconds * 1000))
+
+    print('%-16s %10s %10s %10s %10s %10s' % ('phase', 'time (ms)', 'API calls', 'sysex',
+                                              'bytes', 'objects'))
+    for phase in PHASES:
+        del h.c_instance.sent[:]
+        del h.c_instance.log[:]
+        gc.collect()
+        objects = len(gc.get_objects())
+        h.clear_stats()
+
+        (_, seconds) = driver.timed(phase, h, repeats)
+        api_calls = sum(h.api_calls().values())
+        sysex = h.sent_sysex()
+        sysex_bytes = sum(len(m) for m in sysex)
+
+        # only counting objects kept by the surface, not the recorded output
+        del h.c_instance.sent[:]
+        del h.c_instance.log[:]
+        gc.collect()
+        objects = len(gc.get_objects()) - objects
+
+        print('%-16s %10.2f %10d %10d %10d %+10d' % (phase.__name__, seconds * 1000, api_calls,
+                                                     len(sysex), sysex_bytes, objects))
+
+    h.disconnect()
+
+
+if __name__ == '__main__':
+    main(*[int(a) for a in sys.argv[1:]])
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# driver puts the stand-in Live modules and the op1 package on sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,298 @@
+"""Behaviour of the OP-1 surface driven through driver.Harness.
+
+    python -m pytest sim/tests
+
+Like the surface, these run on Python 2.7.
+"""
+
+import random
+
+import driver
+import replay_trace
+from _Framework.InputControlElement import InputControlElement
+from op1 import consts
+from op1.OP1SysEx import COLORS_HEADER, TEXT_HEADER
+from op1.OP1Trace import OP1TraceReplayer, read_trace, RECORD_OUT
+
+SEEDS = (1, 2, 3)
+
+SETTLE_TICKS = consts.TRACK_SELECT_SETTLE_TICKS + 1
+
+
+def all_tracks(song):
+    return tuple(song.tracks) + tuple(song.return_tracks) + (song.master_track,)
+
+
+# connection
+
+def test_stays_connected_over_long_run():
+    h = driver.Harness(driver.build_song(8, 4))
+    requests = h.c_instance.identity_requests
+
+    h.tick(1000)
+
+    # keep-alives kept going out and were answered
+    assert h.surface.device_connected
+    assert h.c_instance.identity_requests - requests >= 1000 // (
+        consts.HANDSHAKE_KEEPALIVE_TICKS + 1)
+
+    # and the display still follows the surface
+    h.clear_stats()
+    h.set_mode(consts.OP1_MODE_MIXER)
+    h.tick()
+    assert [m for m in h.sent_sysex() if m[:len(TEXT_HEADER)] == TEXT_HEADER]
+    h.disconnect()
+
+
+def test_unanswered_keep_alive_disconnects():
+    h = driver.Harness(driver.build_song(8, 4))
+    h.answer_identity = False
+
+    h.tick(consts.HANDSHAKE_KEEPALIVE_TICKS + consts.HANDSHAKE_KEEPALIVE_TIMEOUT_TICKS + 2)
+
+    assert not h.surface.device_connected
+    h.disconnect()
+
+
+# clip strip
+
+def baseline_colors_frame(h):
+    """Color frame of the full recompute done by the baseline update_display_clips."""
+    session = h.surface._session
+    tracks_len = min(len(h.song.tracks) - session._track_offset, consts.NUM_TRACKS)
+
+    colors = []
+    for i in range(tracks_len):
+        clip_slot = session.scene(0).clip_slot(i)
+
+        color = (0x00, 0x00, 0x00)
+        if (clip_slot is not None) and (clip_slot._clip_slot is not None):
+            if clip_slot.has_clip():
+                clip_color = clip_slot._clip_slot.clip.color
+                color = (((clip_color >> 16) & 0xff) >> 1,
+                         ((clip_color >> 8) & 0xff) >> 1,
+                         (clip_color & 0xff) >> 1)
+        colors += color
+
+    return COLORS_HEADER + (max(tracks_len, 0),) + tuple(colors) + (0xf7,)
+
+
+def last_colors_frame(h):
+    frames = [m for m in h.sent_sysex() if m[:len(COLORS_HEADER)] == COLORS_HEADER]
+    return frames[-1]
+
+
+def edit_song(h, rng):
+    song = h.song
+    session = h.surface._session
+    action = rng.randrange(6)
+
+    if action == 0:
+        # adding or removing a clip
+        track = rng.choice(song.tracks)
+        slot = rng.choice(track.clip_slots)
+        if slot.has_clip:
+            slot.delete_clip()
+        else:
+            slot.create_clip(color=rng.randrange(0x1000000))
+    elif action == 1:
+        # recoloring a clip
+        slots = [cs for t in song.tracks for cs in t.clip_slots if cs.has_clip]
+        if slots:
+            rng.choice(slots).clip.color = rng.randrange(0x1000000)
+    elif action == 2:
+        # moving the session ring
+        session.set_offsets(rng.randrange(len(song.tracks)), rng.randrange(len(song.scenes)))
+    elif action == 3:
+        song.create_midi_track(rng.randrange(len(song.tracks) + 1))
+        h.rebuild()
+    elif action == 4:
+        if len(song.tracks) > 2:
+            song.delete_track(rng.randrange(len(song.tracks)))
+            h.rebuild()
+    else:
+        song.create_scene(rng.randrange(len(song.scenes) + 1))
+        h.rebuild()
+
+
+def test_clip_strip_matches_full_recompute():
+    for seed in SEEDS:
+        rng = random.Random(seed)
+        h = driver.Harness(driver.build_song(20, 6))
+
+        for _ in range(150):
+            for _ in range(rng.randrange(1, 4)):
+                edit_song(h, rng)
+            h.tick()
+            assert last_colors_frame(h) == baseline_colors_frame(h)
+        h.disconnect()
+
+
+# mode and channel strip bindings
+
+def control_ids(value):
+    if isinstance(value, InputControlElement):
+        return value.message_identifier()
+    if isinstance(value, (tuple, list)) and value:
+        if all((v is None) or isinstance(v, InputControlElement) for v in value):
+            return tuple(v.message_identifier() if v is not None else None for v in value)
+    return None
+
+
+def listener_name(callback):
+    owner = getattr(callback, '__self__', None)
+    return (type(owner).__name__, getattr(callback, '__name__', type(callback).__name__))
+
+
+def bindings(h):
+    """Listeners of every control, controls held by the components and the
+    active dispatch entries, by name and identifier so that two surfaces
+    can be compared."""
+    surface = h.surface
+    selector = surface._operation_mode_selector
+    mixer = surface._mixer
+
+    listeners = {}
+    for control in surface._controls:
+        names = listeners.setdefault((control.message_type(), control.message_identifier()), [])
+        names.extend(listener_name(callback) for (callback, _) in control._value_listeners)
+    listeners = dict((key, sorted(names)) for (key, names) in listeners.items() if names)
+
+    components = [('selected strip', mixer.selected_strip()), ('mixer', mixer),
+                  ('session', surface._session), ('transport', surface._transport)]
+    components += [('strip %d' % i, s) for (i, s) in enumerate(mixer._channel_strips)]
+    components += [('return strip %d' % i, s) for (i, s) in enumerate(mixer._return_strips)]
+
+    held = {}
+    for (name, component) in components:
+        for (attr, value) in vars(component).items():
+            ids = control_ids(value)
+            if ids is not None:
+                held[(name, attr)] = ids
+        track = getattr(component, '_track', None)
+        if track is not None:
+            held[(name, '_track')] = track.name
+
+    dispatch = {}
+    for (name, table) in (('note keys', selector._note_keys_dispatch),
+                          ('buttons', selector._buttons_dispatch)):
+        dispatch[name] = sorted((identifier, handler.__name__, index)
+                                for (identifier, (handler, index)) in table._active.items())
+
+    return {'mode': selector.mode_index, 'mapping': selector._mapping.name,
+            'listeners': listeners, 'held': held, 'dispatch': dispatch}
+
+
+def fresh_bindings(mode, selected):
+    # surface built with the final selection, so its strip was never rebound
+    song = driver.build_song(24, 4)
+    song.view.selected_track = all_tracks(song)[selected]
+    h = driver.Harness(song)
+    h.set_mode(mode)
+    h.tick(SETTLE_TICKS)
+
+    result = bindings(h)
+    h.disconnect()
+    return result
+
+
+def scrolled_bindings(seed, final):
+    rng = random.Random(seed)
+    h = driver.Harness(driver.build_song(24, 4))
+    tracks = all_tracks(h.song)
+
+    for _ in range(200):
+        if rng.random() < 0.3:
+            h.set_mode(rng.randrange(consts.NUM_MODES))
+        else:
+            h.song.view.selected_track = rng.choice(tracks)
+        h.tick(rng.randrange(3))
+
+    if final is None:
+        final = rng.randrange(len(h.song.tracks))
+    h.song.view.selected_track = tracks[final]
+    h.tick(SETTLE_TICKS)
+
+    mode = h.surface._operation_mode_selector.mode_index
+    result = bindings(h)
+    h.disconnect()
+    return (mode, final, result)
+
+
+def test_bindings_match_fresh_selector():
+    for seed in SEEDS:
+        # ending on each kind of strip profile: master, return and midi track
+        for final in (-1, -2, None):
+            (mode, selected, scrolled) = scrolled_bindings(seed, final)
+            assert scrolled == fresh_bindings(mode, selected)
+
+
+# trace replay
+
+def replay(records):
+    h = driver.Harness(driver.build_song(16, 16), connect=False)
+    h.clear_stats()
+    OP1TraceReplayer(h.surface.receive_midi, h.surface.update_display).replay(records)
+    h.disconnect()
+    return [m for (_, m) in h.c_instance.sent]
+
+
+def test_trace_replay_is_identical(tmpdir):
+    path = str(tmpdir.join('session.trace'))
+    replay_trace.record(path, 3)
+
+    records = read_trace(path)
+    expected = [midi_bytes for (_, kind, midi_bytes) in records if kind == RECORD_OUT]
+
+    # init frames were sent before clear_stats, disconnect frames after replaying
+    sent = replay(records)
+    assert sent
+    assert sent == expected[len(expected) - len(sent):]
+    assert replay(records) == sent
+
+
+def test_trace_is_readable_while_recording(tmpdir):
+    path = str(tmpdir.join('live.trace'))
+    h = driver.Harness(driver.build_song(8, 4))
+    h.surface.start_trace(path)
+
+    for mode in range(consts.NUM_MODES):
+        h.set_mode(mode)
+        h.tick()
+
+    # an idle tick writes out what was recorded, without closing the trace
+    h.tick(2)
+    records = read_trace(path)
+    assert records
+    assert h.surface._trace.records - len(records) <= 1
+    h.disconnect()
+
+
+# clear track
+
+def test_clear_track_resets_only_set_tracks():
+    h = driver.Harness(driver.build_song(8, 2, num_returns=2))
+    tracks = h.song.tracks
+    returns = h.song.return_tracks
+
+    tracks[1].arm = True
+    tracks[2].solo = True
+    tracks[2].mute = True
+    tracks[5].arm = True
+    returns[0].solo = True
+    returns[1].mute = True
+    h.tick()
+
+    h.clear_stats()
+    h.press(consts.OP1_SS8_BUTTON)
+
+    writes = dict((k, v) for (k, v) in h.api_calls('Track.').items() if k.endswith('='))
+    assert writes == {'Track.arm=': 2, 'Track.solo=': 2, 'Track.mute=': 2}
+    for track in tuple(tracks) + tuple(returns):
+        assert not (track.arm or track.solo or track.mute)
+
+    # nothing left to reset
+    h.clear_stats()
+    h.press(consts.OP1_SS8_BUTTON)
+    assert not [k for k in h.api_calls('Track.') if k.endswith('=')]
+    h.disconnect()